@@ -11,7 +11,7 @@ Módulos disponibles:
 - Funciones de matriz: Operaciones con matrices
 """
 
-from .linAlg import Vector, Matrix
+from .linAlg import Vector, Matrix, FlatStorage, MatrixView, SparseMatrix, Expression, Profile, MinorCache, MappedMatrix
 from .linAlg import (
     # Funciones de vector
     dot_product,
@@ -28,8 +28,55 @@ from .linAlg import (
     matrix_multiply,
     transpose,
     determinant,
-    inverse
+    inverse,
     
+    # Operaciones elemento a elemento
+    apply,
+    iadd,
+    imul,
+    sum_along,
+    mean_along,
+    max_along,
+    
+    # Lotes
+    MatrixBatch,
+    VectorBatch,
+    batch_matmul,
+    batch_det,
+    batch_inverse,
+    batch_dot,
+    batch_cross,
+    
+    # Backends
+    set_backend,
+    get_backend,
+    
+    # Ejecución en paralelo
+    parallel,
+    
+    # Evaluación diferida
+    lazy,
+    
+    # Instrumentación
+    profile,
+    
+    # Sistemas lineales
+    solve,
+    lstsq,
+    
+    # Factorizaciones
+    LUDecomposition,
+    lu_decomposition,
+    CholeskyDecomposition,
+    cholesky_decomposition,
+    QRDecomposition,
+    qr_decomposition,
+    
+    # Métodos iterativos y valores propios
+    conjugate_gradient,
+    power_iteration,
+    inverse_iteration,
+    eigen_decomposition
 )
 
 __version__ = "1.0.0"
@@ -37,6 +84,13 @@ __author__ = "Andrés Mateus Taborda"
 __all__ = [
     'Vector',
     'Matrix',
+    'FlatStorage',
+    'MatrixView',
+    'SparseMatrix',
+    'Expression',
+    'Profile',
+    'MinorCache',
+    'MappedMatrix',
     'dot_product',
     'magnitude',
     'normalize',
@@ -49,5 +103,35 @@ __all__ = [
     'matrix_multiply',
     'transpose',
     'determinant',
-    'inverse'
+    'inverse',
+    'apply',
+    'iadd',
+    'imul',
+    'sum_along',
+    'mean_along',
+    'max_along',
+    'MatrixBatch',
+    'VectorBatch',
+    'batch_matmul',
+    'batch_det',
+    'batch_inverse',
+    'batch_dot',
+    'batch_cross',
+    'set_backend',
+    'get_backend',
+    'parallel',
+    'lazy',
+    'profile',
+    'solve',
+    'lstsq',
+    'LUDecomposition',
+    'lu_decomposition',
+    'CholeskyDecomposition',
+    'cholesky_decomposition',
+    'QRDecomposition',
+    'qr_decomposition',
+    'conjugate_gradient',
+    'power_iteration',
+    'inverse_iteration',
+    'eigen_decomposition'
 ]
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Benchmark de backends
+=====================
+
+Mide cada función que despacha al backend NumPy con ambos backends y
+muestra la tabla de aceleración (tiempo python / tiempo numpy).
+
+Uso:
+    python bench_backend.py
+    python bench_backend.py --sizes 32 128 --repeat 5
+"""
+
+import argparse
+import random
+import time
+
+import linAlg
+from linAlg import (Matrix, Vector, dot_product, matrix_multiply, determinant,
+                    inverse, transpose, scale, add, subtract, set_backend)
+
+
+def casos(n: int, rng: random.Random) -> dict:
+    """Construye las llamadas a medir para matrices n x n de floats."""
+    a = Matrix([[rng.random() for _ in range(n)] for _ in range(n)])
+    b = Matrix([[rng.random() for _ in range(n)] for _ in range(n)])
+    v1 = Vector([rng.random() for _ in range(n * n)])
+    v2 = Vector([rng.random() for _ in range(n * n)])
+    ac, bc = a.compact(), b.compact()
+    # determinant e inverse reciben una matriz nueva para no reutilizar la LU guardada
+    return {
+        "dot_product": lambda: dot_product(v1, v2),
+        "matrix_multiply": lambda: matrix_multiply(a, b),
+        "determinant": lambda: determinant(Matrix(a.data)),
+        "inverse": lambda: inverse(Matrix(a.data)),
+        "transpose": lambda: transpose(a),
+        "scale": lambda: scale(a, 2.5),
+        "add": lambda: add(a, b),
+        "subtract": lambda: subtract(a, b),
+        "add (compacta)": lambda: add(ac, bc),
+        "scale (compacta)": lambda: scale(ac, 2.5),
+    }
+
+
+def medir(funcion, repeticiones: int) -> float:
+    """Retorna el mejor tiempo (en segundos) de varias ejecuciones."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los backends python y numpy")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 128],
+                        help="Tamaños n de las matrices n x n")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición")
+    args = parser.parse_args()
+
+    if linAlg.np is None:
+        print("NumPy no está instalado; no hay backend con el cual comparar.")
+        return
+
+    print(f"{'función':<16} {'n':>5} {'python (s)':>12} {'numpy (s)':>12} {'aceleración':>12}")
+    print("-" * 61)
+    rng = random.Random(0)
+    try:
+        for n in args.sizes:
+            for nombre, caso in casos(n, rng).items():
+                set_backend("python")
+                t_python = medir(caso, args.repeat)
+                set_backend("numpy")
+                t_numpy = medir(caso, args.repeat)
+                print(f"{nombre:<16} {n:>5} {t_python:>12.5f} {t_numpy:>12.5f} {t_python / t_numpy:>11.1f}x")
+    finally:
+        set_backend("python")
+
+
+if __name__ == "__main__":
+    main()
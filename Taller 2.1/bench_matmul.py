@@ -0,0 +1,76 @@
+"""
+Benchmark de matrix_multiply
+============================
+
+Compara el núcleo actual de matrix_multiply con la implementación anterior
+(transponer m2, llamar a vector_multiply por columna y transponer el
+resultado) para matrices cuadradas de 16x16 a 512x512.
+
+Uso:
+    python bench_matmul.py
+    python bench_matmul.py --sizes 16 32 64 --reference-max 128
+"""
+
+import argparse
+import random
+import time
+
+from linAlg import Matrix, matrix_multiply
+
+
+def matrix_multiply_referencia(m1: Matrix, m2: Matrix) -> list:
+    """Implementación anterior de matrix_multiply, conservada como referencia."""
+    columnas = [[m2.data[i][j] for i in range(len(m2.data))] for j in range(len(m2.data[0]))]
+    matmul = []
+    for columna in columnas:
+        mulvec = []
+        for i in range(len(m1)):
+            suma = 0
+            for j in range(len(m1[0])):
+                suma += m1[i][j] * columna[j]
+            mulvec.append(suma)
+        matmul.append(mulvec)
+    return [[matmul[i][j] for i in range(len(matmul))] for j in range(len(matmul[0]))]
+
+
+def matriz_aleatoria(n: int, semilla: int) -> Matrix:
+    """Crea una matriz n x n de floats aleatorios reproducible."""
+    rng = random.Random(semilla)
+    return Matrix([[rng.random() for _ in range(n)] for _ in range(n)])
+
+
+def medir(funcion, *args, repeticiones: int = 1) -> float:
+    """Retorna el mejor tiempo (en segundos) de varias ejecuciones."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(*args)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de matrix_multiply")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 32, 64, 128, 256, 512],
+                        help="Tamaños n de las matrices n x n")
+    parser.add_argument("--reference-max", type=int, default=512,
+                        help="Tamaño máximo para el que se mide la implementación anterior")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición")
+    args = parser.parse_args()
+
+    print(f"{'n':>6} {'anterior (s)':>14} {'actual (s)':>12} {'aceleración':>12}")
+    print("-" * 48)
+    for n in args.sizes:
+        a = matriz_aleatoria(n, 1)
+        b = matriz_aleatoria(n, 2)
+        repeticiones = args.repeat if n <= 128 else 1
+        actual = medir(matrix_multiply, a, b, repeticiones=repeticiones)
+        if n <= args.reference_max:
+            anterior = medir(matrix_multiply_referencia, a, b, repeticiones=repeticiones)
+            print(f"{n:>6} {anterior:>14.4f} {actual:>12.4f} {anterior / actual:>11.1f}x")
+        else:
+            print(f"{n:>6} {'-':>14} {actual:>12.4f} {'-':>12}")
+
+
+if __name__ == "__main__":
+    main()
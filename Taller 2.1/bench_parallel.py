@@ -0,0 +1,70 @@
+"""
+Benchmark de la ejecución en paralelo
+=====================================
+
+Mide matrix_multiply y get_cofactors_matrix con 1 a 16 procesos y muestra
+la aceleración respecto a la ejecución en serie. Con más procesos que
+núcleos disponibles la aceleración deja de crecer.
+
+Uso:
+    python bench_parallel.py
+    python bench_parallel.py --sizes 256 --workers 1 2 4 --cofactor-size 0
+"""
+
+import argparse
+import os
+import random
+import time
+
+from linAlg import Matrix, matrix_multiply, get_cofactors_matrix, parallel
+
+
+def medir(funcion, repeticiones: int) -> float:
+    """Retorna el mejor tiempo (en segundos) de varias ejecuciones."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escalamiento por número de procesos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 512],
+                        help="Tamaños n de las matrices n x n para matrix_multiply")
+    parser.add_argument("--cofactor-size", type=int, default=40,
+                        help="Tamaño de la matriz para get_cofactors_matrix (0 para omitir)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="Números de procesos a medir")
+    parser.add_argument("--repeat", type=int, default=1, help="Repeticiones por medición")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    casos = {}
+    for n in args.sizes:
+        a = Matrix([[rng.random() for _ in range(n)] for _ in range(n)])
+        b = Matrix([[rng.random() for _ in range(n)] for _ in range(n)])
+        casos[f"matrix_multiply {n}"] = lambda a=a, b=b: matrix_multiply(a, b)
+    if args.cofactor_size:
+        n = args.cofactor_size
+        c = Matrix([[rng.random() for _ in range(n)] for _ in range(n)])
+        casos[f"cofactores {n}"] = lambda c=c: get_cofactors_matrix(c)
+
+    print(f"Núcleos disponibles: {os.cpu_count()}")
+    print(f"{'operación':<22} {'procesos':>9} {'tiempo (s)':>12} {'aceleración':>12}")
+    print("-" * 58)
+    for nombre, caso in casos.items():
+        serie = medir(caso, args.repeat)
+        print(f"{nombre:<22} {'serie':>9} {serie:>12.4f} {1:>11.1f}x")
+        for workers in args.workers:
+            if workers < 2:
+                continue
+            # El pool se crea antes de medir; min_work=0 obliga a repartir siempre
+            with parallel(workers=workers, min_work=0):
+                tiempo = medir(caso, args.repeat)
+            print(f"{nombre:<22} {workers:>9} {tiempo:>12.4f} {serie / tiempo:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
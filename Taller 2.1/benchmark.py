@@ -0,0 +1,301 @@
+"""
+Suite de benchmarks de la librería
+==================================
+
+Mide cada función pública de __all__ (dot_product, matrix_multiply,
+determinant, inverse, transpose, ...) para varios tamaños n, registra
+operaciones por segundo y el pico de memoria (tracemalloc), guarda los
+resultados en JSON y los compara con una línea base guardada.
+
+Las matrices son n x n de floats; los vectores tienen n * n componentes
+para que ambos recorran la misma cantidad de elementos.
+
+Uso:
+    python -m benchmark                                  # guarda bench_results.json
+    python -m benchmark --sizes 16 64 --only matrix_multiply inverse
+    python -m benchmark --output base.json               # crear una línea base
+    python -m benchmark --baseline base.json --threshold 0.15
+
+Con --baseline el proceso termina con código 1 si alguna medición es más
+lenta que la línea base en más del umbral, para usarlo como control
+antes de aceptar cambios de rendimiento.
+"""
+
+import argparse
+import ast
+import inspect
+import json
+import operator
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import linAlg
+from linAlg import Matrix, Vector, SparseMatrix, MatrixBatch, VectorBatch
+
+# Funciones de __all__ que no se miden aquí, con el motivo
+EXCLUIDAS = {
+    "set_backend": "configuración (use --backend)",
+    "get_backend": "configuración",
+    "parallel": "depende del número de núcleos; ver bench_parallel.py",
+}
+
+# Número de matrices o vectores en los casos de lotes
+TAMANO_LOTE = 16
+
+
+def nombres_publicos() -> list:
+    """Lee __all__ de __init__.py sin importar el paquete (su carpeta tiene espacios)."""
+    ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__init__.py")
+    with open(ruta, encoding="utf-8") as archivo:
+        arbol = ast.parse(archivo.read())
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.Assign) and any(getattr(t, "id", None) == "__all__" for t in nodo.targets):
+            return ast.literal_eval(nodo.value)
+    return []
+
+
+def funciones_publicas() -> list:
+    """Nombres de __all__ que son funciones (las clases se miden a través de ellas)."""
+    return [nombre for nombre in nombres_publicos()
+            if inspect.isfunction(getattr(linAlg, nombre, None))]
+
+
+def matriz(n: int, rng: random.Random, columnas: int = None) -> Matrix:
+    """Matriz n x columnas de floats aleatorios."""
+    return Matrix([[rng.random() for _ in range(columnas or n)] for _ in range(n)])
+
+
+def matriz_definida_positiva(n: int, rng: random.Random) -> Matrix:
+    """Matriz simétrica definida positiva (A·Aᵀ + n·I)."""
+    a = matriz(n, rng)
+    producto = linAlg.matrix_multiply(a, a.T).tolist()
+    for i in range(n):
+        producto[i][i] += n
+    return Matrix(producto)
+
+
+def vector(n: int, rng: random.Random) -> Vector:
+    """Vector de n floats aleatorios."""
+    return Vector([rng.random() for _ in range(n)])
+
+
+def caso_lazy(a: Matrix, b: Matrix, c: Matrix):
+    """Expresión fusionada a + b - c * 2 construida en un bloque lazy()."""
+    def ejecutar():
+        with linAlg.lazy():
+            resultado = a + b - c * 2
+        return resultado.eval()
+    return ejecutar
+
+
+def caso_profile(a: Matrix, b: Matrix):
+    """matrix_multiply dentro de profile(), para seguir el costo de la instrumentación."""
+    def ejecutar():
+        with linAlg.profile():
+            return linAlg.matrix_multiply(a, b)
+    return ejecutar
+
+
+def construir_casos(n: int, rng: random.Random) -> dict:
+    """
+    Construye la llamada a medir de cada función para el tamaño n.
+
+    Las funciones que guardan una factorización reciben una matriz nueva en
+    cada llamada para no medir la factorización ya calculada.
+    """
+    a, b, c = matriz(n, rng), matriz(n, rng), matriz(n, rng)
+    spd = matriz_definida_positiva(n, rng)
+    alta = matriz(2 * n, rng, n)
+    v1, v2 = vector(n * n, rng), vector(n * n, rng)
+    x = vector(n, rng)
+    v3, w3 = vector(3, rng), vector(3, rng)
+    lote_a = MatrixBatch([matriz(n, rng) for _ in range(TAMANO_LOTE)])
+    lote_b = MatrixBatch([matriz(n, rng) for _ in range(TAMANO_LOTE)])
+    lote_v = VectorBatch([vector(n, rng) for _ in range(TAMANO_LOTE)])
+    lote_w = VectorBatch([vector(n, rng) for _ in range(TAMANO_LOTE)])
+    lote_3 = VectorBatch([vector(3, rng) for _ in range(n * n)])
+    lote_3b = VectorBatch([vector(3, rng) for _ in range(n * n)])
+    dispersa = SparseMatrix.from_dense(Matrix([[v if rng.random() < 0.1 else 0.0 for v in fila] for fila in a.data]))
+    filas_a = a.tolist()
+    acumulada = Matrix(a.tolist())  # iadd e imul la modifican en el lugar
+    return {
+        "dot_product": lambda: linAlg.dot_product(v1, v2),
+        "magnitude": lambda: linAlg.magnitude(v1),
+        "normalize": lambda: linAlg.normalize(v1),
+        "cross_product": lambda: linAlg.cross_product(v3, w3),
+        "angle_between": lambda: linAlg.angle_between(v1, v2),
+        "scale": lambda: linAlg.scale(a, 2.5),
+        "add": lambda: linAlg.add(a, b),
+        "subtract": lambda: linAlg.subtract(a, b),
+        "vector_multiply": lambda: linAlg.vector_multiply(a, x),
+        "matrix_multiply": lambda: linAlg.matrix_multiply(a, b),
+        "transpose": lambda: linAlg.transpose(a).tolist(),
+        "determinant": lambda: linAlg.determinant(Matrix(filas_a)),
+        "inverse": lambda: linAlg.inverse(Matrix(filas_a)),
+        "apply": lambda: linAlg.apply(operator.add, a, x),
+        "iadd": lambda: linAlg.iadd(acumulada, x),
+        "imul": lambda: linAlg.imul(acumulada, 1.0),
+        "sum_along": lambda: linAlg.sum_along(a, 0),
+        "mean_along": lambda: linAlg.mean_along(a, 1),
+        "max_along": lambda: linAlg.max_along(a, 0),
+        "batch_matmul": lambda: linAlg.batch_matmul(lote_a, lote_b),
+        "batch_det": lambda: linAlg.batch_det(lote_a),
+        "batch_inverse": lambda: linAlg.batch_inverse(lote_a),
+        "batch_dot": lambda: linAlg.batch_dot(lote_v, lote_w),
+        "batch_cross": lambda: linAlg.batch_cross(lote_3, lote_3b),
+        "lazy": caso_lazy(a, b, c),
+        "profile": caso_profile(a, b),
+        "solve": lambda: linAlg.solve(Matrix(filas_a), x),
+        "lstsq": lambda: linAlg.lstsq(alta, vector(2 * n, random.Random(n))),
+        "lu_decomposition": lambda: linAlg.lu_decomposition(filas_a),
+        "cholesky_decomposition": lambda: linAlg.cholesky_decomposition(spd.data),
+        "qr_decomposition": lambda: linAlg.qr_decomposition(alta.data),
+        "conjugate_gradient": lambda: linAlg.conjugate_gradient(spd, x),
+        "power_iteration": lambda: linAlg.power_iteration(spd),
+        "inverse_iteration": lambda: linAlg.inverse_iteration(spd, shift=n),
+        "eigen_decomposition": lambda: linAlg.eigen_decomposition(spd),
+        "sparse matrix_multiply": lambda: linAlg.matrix_multiply(dispersa, b),
+    }
+
+
+def medir(funcion, repeticiones: int, tiempo_minimo: float) -> dict:
+    """
+    Mide una llamada: mejor tiempo por operación y pico de memoria.
+
+    El número de llamadas por repetición se ajusta para que cada repetición
+    dure al menos tiempo_minimo segundos; se reporta la mejor repetición.
+    El pico de memoria se mide aparte, en una sola llamada bajo tracemalloc,
+    para que el rastreo no altere los tiempos.
+    """
+    funcion()  # calentamiento
+    llamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        transcurrido = time.perf_counter() - inicio
+        if transcurrido >= tiempo_minimo or llamadas >= 1 << 20:
+            break
+        llamadas *= 2 if transcurrido == 0 else max(2, min(10, int(tiempo_minimo / transcurrido) + 1))
+
+    mejor = transcurrido
+    for _ in range(repeticiones - 1):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        funcion()
+        pico = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+    tiempo = mejor / llamadas
+    return {"time_s": tiempo, "ops_per_s": 1 / tiempo if tiempo else float("inf"), "peak_bytes": pico}
+
+
+def ejecutar_suite(tamanos: list, repeticiones: int, tiempo_minimo: float, solo=None) -> dict:
+    """Mide todos los casos para cada tamaño y retorna los resultados por función y tamaño."""
+    resultados = {}
+    for n in tamanos:
+        casos = construir_casos(n, random.Random(n))
+        for nombre, caso in casos.items():
+            if solo and nombre not in solo:
+                continue
+            medicion = medir(caso, repeticiones, tiempo_minimo)
+            resultados.setdefault(nombre, {})[str(n)] = medicion
+            print(f"{nombre:<24} {n:>5} {medicion['ops_per_s']:>14.1f} {medicion['peak_bytes'] / 1024:>12.1f}")
+    return resultados
+
+
+def comparar(resultados: dict, linea_base: dict, umbral: float) -> list:
+    """
+    Compara con una línea base y retorna las regresiones encontradas.
+
+    Una medición es una regresión si sus operaciones por segundo caen por
+    debajo de (1 - umbral) veces las de la línea base.
+    """
+    regresiones = []
+    print(f"\n{'función':<24} {'n':>5} {'base ops/s':>14} {'ops/s':>14} {'cambio':>9}")
+    print("-" * 70)
+    for nombre, por_tamano in resultados.items():
+        for n, medicion in por_tamano.items():
+            anterior = linea_base.get(nombre, {}).get(n)
+            if anterior is None:
+                continue
+            cambio = medicion["ops_per_s"] / anterior["ops_per_s"] - 1
+            marca = ""
+            if cambio < -umbral:
+                regresiones.append((nombre, n, cambio))
+                marca = "  REGRESIÓN"
+            print(f"{nombre:<24} {n:>5} {anterior['ops_per_s']:>14.1f} {medicion['ops_per_s']:>14.1f} {cambio:>+8.1%}{marca}")
+    return regresiones
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Suite de benchmarks y control de regresiones de linAlg")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 32, 64],
+                        help="Tamaños n de las matrices n x n")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición")
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="Duración mínima (s) de cada repetición")
+    parser.add_argument("--only", nargs="+", help="Medir solo estas funciones")
+    parser.add_argument("--backend", choices=sorted(linAlg._BACKENDS), default="python",
+                        help="Backend con el que se mide")
+    parser.add_argument("--output", default="bench_results.json", help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", help="Archivo JSON de una ejecución anterior con el cual comparar")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Caída relativa de ops/s que se considera regresión (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    casos_conocidos = set(construir_casos(2, random.Random(0)))
+    sin_caso = [nombre for nombre in funciones_publicas()
+                if nombre not in casos_conocidos and nombre not in EXCLUIDAS]
+    if sin_caso:
+        print(f"Aviso: funciones públicas sin caso de benchmark: {', '.join(sin_caso)}")
+
+    backend = linAlg.set_backend(args.backend)
+    print(f"{'función':<24} {'n':>5} {'ops/s':>14} {'pico (KiB)':>12}")
+    print("-" * 58)
+    try:
+        resultados = ejecutar_suite(args.sizes, args.repeat, args.min_time, args.only)
+    finally:
+        linAlg.set_backend("python")
+
+    informe = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": backend,
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+            "min_time": args.min_time,
+        },
+        "results": resultados,
+    }
+    with open(args.output, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2)
+    print(f"\nResultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as archivo:
+            linea_base = json.load(archivo)["results"]
+        regresiones = comparar(resultados, linea_base, args.threshold)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresión(es) por encima del umbral de {args.threshold:.0%}")
+            return 1
+        print(f"\nSin regresiones por encima del umbral de {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -168,6 +168,861 @@ def test_matrices_especiales():
         print(f"✗ Error en matrices especiales: {e}")
 
 
+def test_determinante_lu():
+    """Pruebas del determinante calculado por factorización LU."""
+    print("\nProbando determinante por LU...")
+    
+    try:
+        from fractions import Fraction
+        from linAlg import Matrix, determinant, get_det
+        
+        # Test modo exacto para enteros
+        m = Matrix([[2, -3, 1], [2, 0, -1], [1, 4, 5]])
+        det = determinant(m)
+        if det == 49 and type(det) is int:
+            print(f"✓ Determinante exacto 3x3: {det}")
+        else:
+            print(f"✗ Determinante exacto 3x3 incorrecto: {det}")
+        
+        # Test matriz singular
+        if get_det([[1, 2, 3], [2, 4, 6], [1, 1, 1]]) == 0:
+            print("✓ Determinante de matriz singular: 0")
+        else:
+            print("✗ Determinante de matriz singular incorrecto")
+        
+        # Test entradas Fraction y float
+        if get_det([[Fraction(1, 2), 1, 0], [0, 2, 0], [0, 0, 3]]) == Fraction(3):
+            print("✓ Determinante con Fraction")
+        else:
+            print("✗ Determinante con Fraction incorrecto")
+        
+        mf = Matrix([[4.0, 3.0, 0.0], [3.0, 4.0, -1.0], [0.0, -1.0, 4.0]])
+        if abs(mf.determinant - 24.0) < 1e-9:
+            print(f"✓ Determinante float: {mf.determinant}")
+        else:
+            print(f"✗ Determinante float incorrecto: {mf.determinant}")
+        
+        # Test tamaño grande (inviable con cofactores)
+        n = 60
+        grande = Matrix([[1 if i == j else (1 if j == i + 1 else 0) for j in range(n)] for i in range(n)])
+        if determinant(grande) == 1:
+            print(f"✓ Determinante {n}x{n}: 1")
+        else:
+            print(f"✗ Determinante {n}x{n} incorrecto")
+            
+    except Exception as e:
+        print(f"✗ Error en determinante LU: {e}")
+
+
+def test_inversa_lu():
+    """Pruebas de la inversa obtenida de la factorización LU guardada."""
+    print("\nProbando inversa por LU...")
+    
+    try:
+        from linAlg import Matrix, inverse
+        
+        m = Matrix([[4, 7, 2], [3, 6, 1], [2, 5, 3]])
+        inv = inverse(m)
+        producto = [[sum(m[i][k] * inv[k][j] for k in range(3)) for j in range(3)] for i in range(3)]
+        if all(abs(producto[i][j] - (1 if i == j else 0)) < 1e-12 for i in range(3) for j in range(3)):
+            print(f"✓ Inversa 3x3: {inv}")
+        else:
+            print(f"✗ Inversa 3x3 incorrecta: {inv}")
+        
+        # Test reutilización de la factorización
+        lu = m.lu
+        if m.lu is lu and m.determinant == 9:
+            print("✓ Factorización LU reutilizada")
+        else:
+            print("✗ La factorización LU no se reutiliza")
+        
+        # Test invalidación al modificar la matriz
+        m[0, 0] = 5
+        if m.lu is not lu and m.determinant == 22:
+            print("✓ Factorización invalidada tras __setitem__")
+        else:
+            print("✗ La factorización no se invalida tras __setitem__")
+
+        # Test invalidación al escribir directamente en una fila
+        f = Matrix([[2.0, 1.0, 0.0], [1.0, 3.0, 1.0], [0.0, 1.0, 4.0]])
+        antes = f.determinant
+        f[0][0] = 10
+        inv_f = inverse(f)
+        if antes == 18.0 and f.determinant == 106.0 and abs(inv_f[0][0] - 11 / 106) < 1e-12:
+            print("✓ Factorización invalidada tras m[i][j] = x")
+        else:
+            print(f"✗ Factorización vieja tras m[i][j] = x: {f.determinant}")
+
+        # Test matriz singular
+        try:
+            Matrix([[1, 2], [2, 4]]).inverse
+            print("✗ La inversa de una matriz singular no lanza error")
+        except TypeError:
+            print("✓ Inversa de matriz singular lanza TypeError")
+            
+    except Exception as e:
+        print(f"✗ Error en inversa LU: {e}")
+
+
+def test_sistemas_lineales():
+    """Pruebas de solve y lstsq."""
+    print("\nProbando sistemas lineales...")
+    
+    try:
+        from linAlg import Matrix, Vector, solve, lstsq
+        
+        A = Matrix([[4, 1, 2], [1, 5, 3], [2, 3, 6]])
+        b = Vector([7, 9, 11])
+        
+        # Test solve por LU y por Cholesky
+        for metodo in ("lu", "cholesky"):
+            x = solve(A, b, method=metodo)
+            if all(abs(xi - 1) < 1e-12 for xi in x):
+                print(f"✓ solve ({metodo}): {x}")
+            else:
+                print(f"✗ solve ({metodo}) incorrecto: {x}")
+        
+        # Test varios lados derechos a la vez
+        X = solve(A, Matrix([[7, 4], [9, 1], [11, 2]]))
+        if X.shape == (3, 2) and all(abs(X[i][0] - 1) < 1e-12 for i in range(3)):
+            print(f"✓ solve con varios lados derechos: {X}")
+        else:
+            print(f"✗ solve con varios lados derechos incorrecto: {X}")
+        
+        # Test mínimos cuadrados (ajuste de la recta y = 1 + 2x)
+        puntos = Matrix([[1, 0], [1, 1], [1, 2], [1, 3]])
+        coef = lstsq(puntos, [1, 3, 5, 7])
+        if abs(coef[0] - 1) < 1e-12 and abs(coef[1] - 2) < 1e-12:
+            print(f"✓ lstsq sobredeterminado: {coef}")
+        else:
+            print(f"✗ lstsq sobredeterminado incorrecto: {coef}")
+        
+        # Test solución de norma mínima
+        x = lstsq(Matrix([[1, 1, 1]]), [3])
+        if all(abs(xi - 1) < 1e-12 for xi in x):
+            print(f"✓ lstsq subdeterminado: {x}")
+        else:
+            print(f"✗ lstsq subdeterminado incorrecto: {x}")
+            
+    except Exception as e:
+        print(f"✗ Error en sistemas lineales: {e}")
+
+
+def test_metodos_iterativos():
+    """Pruebas de gradiente conjugado, iteración de la potencia e inversa y algoritmo QR."""
+    print("\nProbando métodos iterativos y valores propios...")
+    
+    try:
+        from linAlg import (Matrix, SparseMatrix, conjugate_gradient, power_iteration,
+                            inverse_iteration, eigen_decomposition)
+        
+        A = Matrix([[4, 1, 2], [1, 5, 3], [2, 3, 6]])
+        dispersa = SparseMatrix.from_dense(A)
+        
+        # Test gradiente conjugado (solución exacta [1, 1, 1])
+        residuos = []
+        x = conjugate_gradient(dispersa, [7, 9, 11], trace=residuos)
+        if all(abs(xi - 1) < 1e-9 for xi in x) and residuos[-1] < residuos[0]:
+            print(f"✓ conjugate_gradient con SparseMatrix en {len(residuos) - 1} iteraciones")
+        else:
+            print(f"✗ conjugate_gradient incorrecto: {list(x)}")
+        
+        # Test descomposición completa: A v = λ v para cada columna
+        valores, vectores = eigen_decomposition(A)
+        residuo = max(abs(sum(A[i][k] * vectores[k][j] for k in range(3)) - valores[j] * vectores[i][j])
+                      for i in range(3) for j in range(3))
+        if residuo < 1e-12 and abs(sum(valores) - 15) < 1e-12 and valores[0] > valores[1] > valores[2]:
+            print(f"✓ eigen_decomposition: {list(valores)}")
+        else:
+            print(f"✗ eigen_decomposition incorrecta: {list(valores)}")
+        
+        # Test valores propios extremos
+        mayor, _ = power_iteration(A)
+        menor, _ = inverse_iteration(dispersa, shift=0)
+        if abs(mayor - valores[0]) < 1e-8 and abs(menor - valores[2]) < 1e-8:
+            print(f"✓ power_iteration ({mayor:.6f}) e inverse_iteration ({menor:.6f})")
+        else:
+            print(f"✗ Valores propios extremos incorrectos: {mayor}, {menor}")
+        
+        # Test matriz no simétrica con valores propios reales
+        valores, _ = eigen_decomposition([[2, 1], [0, 3]])
+        if abs(valores[0] - 3) < 1e-12 and abs(valores[1] - 2) < 1e-12:
+            print("✓ eigen_decomposition no simétrica")
+        else:
+            print(f"✗ eigen_decomposition no simétrica incorrecta: {list(valores)}")
+        
+        try:
+            eigen_decomposition([[0, -1], [1, 0]])
+            print("✗ Debería rechazar valores propios complejos")
+        except ValueError:
+            print("✓ Rechaza valores propios complejos")
+        
+    except Exception as e:
+        print(f"✗ Error en métodos iterativos: {e}")
+
+
+def test_estructura():
+    """Pruebas de la detección de estructura y de los caminos rápidos que la usan."""
+    print("\nProbando estructura de matrices...")
+    
+    try:
+        from fractions import Fraction
+        from linAlg import Matrix, identity_matrix, zeros_matrix, matrix_multiply, determinant, inverse, solve
+        
+        A = Matrix([[4, 1, 2], [1, 5, 3], [2, 3, 6]])
+        U = Matrix([[2, 1, 3], [0, 4, 5], [0, 0, 6]])
+        D = Matrix([[2, 0, 0], [0, Fraction(1, 3), 0], [0, 0, 4]])
+        if (A.is_symmetric() and not A.is_diagonal() and U.is_upper_triangular()
+                and U.T.is_lower_triangular() and not Matrix([[1, 2], [3, 4]]).is_symmetric()):
+            print(f"✓ Detección de estructura: {sorted(D.structure)}")
+        else:
+            print("✗ Detección de estructura incorrecta")
+        
+        I = identity_matrix(3)
+        if I.is_identity() and matrix_multiply(I, A) == A and matrix_multiply(A, I) == A:
+            print("✓ Producto por la identidad sin multiplicar")
+        else:
+            print("✗ Producto por la identidad incorrecto")
+        
+        I[0, 1] = 5
+        if I.tolist() == [[1, 5, 0], [0, 1, 0], [0, 0, 1]] and not I.is_identity():
+            print("✓ La identidad se materializa al escribir en ella")
+        else:
+            print(f"✗ Escritura en la identidad incorrecta: {I.tolist()}")
+
+        Z = zeros_matrix(2, 2)
+        Z[0][1] = 5
+        if Z.tolist() == [[0, 5], [0, 0]] and not Z.is_diagonal() and Z.is_upper_triangular():
+            print("✓ Escritura en una fila de zeros_matrix")
+        else:
+            print(f"✗ Escritura en una fila de zeros_matrix incorrecta: {Z.tolist()}")
+
+        # La estructura detectada se descarta al escribir con m[i][j] = x
+        J = Matrix([[1, 0], [0, 1]])
+        B = Matrix([[1, 2], [3, 4]])
+        J.is_identity()
+        J[0][1] = 5
+        E = Matrix([[2.0, 0.0], [0.0, 4.0]])
+        E.is_diagonal()
+        E[0][1] = 1.0
+        if matrix_multiply(J, B).tolist() == [[16, 22], [3, 4]] and inverse(E).tolist() == [[0.5, -0.125], [0.0, 0.25]]:
+            print("✓ Estructura detectada de nuevo tras m[i][j] = x")
+        else:
+            print("✗ Estructura vieja tras m[i][j] = x")
+
+        x = solve(U, [1, 2, 3])
+        if (determinant(U) == 48 and D.determinant == Fraction(8, 3)
+                and inverse(D)[1][1] == 3 and all(abs(v - e) < 1e-12 for v, e in zip(x, [-0.1875, -0.125, 0.5]))):
+            print("✓ Determinante, inversa y solve para matrices triangulares y diagonales")
+        else:
+            print("✗ Caminos rápidos triangular/diagonal incorrectos")
+
+        try:
+            inverse(Matrix([[1, 0], [0, 0]]))
+            print("✗ La inversa de una diagonal singular no lanzó error")
+        except ValueError:
+            print("✓ Inversa de una diagonal singular lanza ValueError")
+
+        M = Matrix([[1, 2, 3], [4, 5, 6]])
+        G = matrix_multiply(M, M.T)
+        if G.tolist() == [[14, 32], [32, 77]] and matrix_multiply(A, A) == Matrix([[21, 15, 23], [15, 35, 35], [23, 35, 49]]):
+            print("✓ Productos simétricos A·Aᵀ y S·S")
+        else:
+            print("✗ Productos simétricos incorrectos")
+        
+    except Exception as e:
+        print(f"✗ Error en estructura de matrices: {e}")
+
+
+def test_elemento_a_elemento():
+    """Pruebas de apply con difusión, operaciones en el lugar y reducciones por eje."""
+    print("\nProbando operaciones elemento a elemento...")
+    
+    try:
+        import operator
+        from linAlg import Matrix, Vector, apply, iadd, imul, sum_along, mean_along, max_along
+        
+        A = Matrix([[1, 2, 3], [4, 5, 6]])
+        fila = Vector([10, 20, 30])
+        columna = Matrix([[100], [200]])
+        if (apply(operator.add, A, fila).tolist() == [[11, 22, 33], [14, 25, 36]]
+                and apply(operator.add, A, columna).tolist() == [[101, 102, 103], [204, 205, 206]]
+                and apply(max, A, 3).tolist() == [[3, 3, 3], [4, 5, 6]]):
+            print("✓ apply con difusión de filas, columnas y escalares")
+        else:
+            print("✗ apply con difusión incorrecto")
+        
+        try:
+            apply(operator.add, A, Vector([1, 2]))
+            print("✗ apply debería rechazar formas incompatibles")
+        except ValueError:
+            print("✓ apply rechaza formas incompatibles")
+        
+        if A + fila == [[11, 22, 33], [14, 25, 36]] and A.compact() + fila == Matrix([[11, 22, 33], [14, 25, 36]]):
+            print("✓ El operador + suma un Vector a cada fila")
+        else:
+            print("✗ Difusión en el operador + incorrecta")
+        
+        B = Matrix([[1, 2, 3], [4, 5, 6]])
+        filas = list(B.data)
+        iadd(B, fila)
+        imul(B, columna)
+        C = A.compact()
+        iadd(C, 1)
+        if (B.tolist() == [[1100, 2200, 3300], [2800, 5000, 7200]] and all(f is g for f, g in zip(filas, B.data))
+                and C.tolist() == [[2, 3, 4], [5, 6, 7]]):
+            print("✓ iadd e imul en el lugar")
+        else:
+            print(f"✗ iadd o imul incorrectos: {B.tolist()}")
+
+        D = Matrix([[1, 2], [3, 4]])
+        E = D.compact()
+        iadd(D, D.T)
+        iadd(E, E.T)
+        if D.tolist() == [[2, 5], [5, 8]] and E.tolist() == [[2, 5], [5, 8]]:
+            print("✓ iadd con una vista de la misma matriz (a += a.T)")
+        else:
+            print(f"✗ iadd con una vista de la misma matriz incorrecto: {D.tolist()} / {E.tolist()}")
+
+        if (list(sum_along(A, 0)) == [5, 7, 9] and list(sum_along(A, 1)) == [6, 15]
+                and list(mean_along(A, 0)) == [2.5, 3.5, 4.5] and list(max_along(A.compact(), 1)) == [3, 6]):
+            print("✓ Reducciones por columnas y por filas")
+        else:
+            print("✗ Reducciones por eje incorrectas")
+        
+    except Exception as e:
+        print(f"✗ Error en operaciones elemento a elemento: {e}")
+
+
+def test_almacenamiento_compacto():
+    """Pruebas del almacenamiento compacto en array('d')."""
+    print("\nProbando almacenamiento compacto...")
+    
+    try:
+        from linAlg import Matrix, Vector
+        
+        m = Matrix([[1, 2], [3, 4]]).compact()
+        if m.is_compact and m.data.buffer.typecode == "d":
+            print(f"✓ Matriz compacta: {m}")
+        else:
+            print("✗ compact no crea un array('d')")
+        
+        # Test operadores sobre el almacenamiento compacto
+        if (m + m).tolist() == [[2, 4], [6, 8]] and (m * 2).tolist() == [[2, 4], [6, 8]] and m.T.tolist() == [[1, 3], [2, 4]]:
+            print("✓ Operadores +, * y T con almacenamiento compacto")
+        else:
+            print("✗ Operadores con almacenamiento compacto incorrectos")
+        
+        if list(m.get_row(1)) == [3, 4] and list(m.get_column(0)) == [1, 3] and m.determinant == -2:
+            print("✓ get_row, get_column y determinante con almacenamiento compacto")
+        else:
+            print("✗ get_row, get_column o determinante incorrectos")
+        
+        # Test vista memoryview sin copia
+        vista = m.data.memoryview()
+        m[0, 0] = 10
+        if vista.shape == (2, 2) and vista[0, 0] == 10:
+            print("✓ memoryview 2D comparte memoria con la matriz")
+        else:
+            print("✗ memoryview no comparte memoria con la matriz")
+        
+        v = Vector([3, 4]).compact()
+        if v.is_compact and v.magnitude == 5:
+            print(f"✓ Vector compacto: {v}")
+        else:
+            print("✗ Vector compacto incorrecto")
+            
+    except Exception as e:
+        print(f"✗ Error en almacenamiento compacto: {e}")
+
+
+def test_vistas():
+    """Pruebas de las vistas sin copia (transpuesta, filas, columnas y submatrices)."""
+    print("\nProbando vistas...")
+    
+    try:
+        from linAlg import Matrix, matrix_multiply
+        
+        for nombre, m in (("listas", Matrix([[1, 2, 3], [4, 5, 6]])), ("compacta", Matrix([[1, 2, 3], [4, 5, 6]]).compact())):
+            t = m.T
+            sub = m[0:2, 1:3]
+            if t.is_view and t.tolist() == [[1, 4], [2, 5], [3, 6]] and sub.tolist() == [[2, 3], [5, 6]]:
+                print(f"✓ Transpuesta y submatriz como vistas ({nombre})")
+            else:
+                print(f"✗ Vistas incorrectas ({nombre})")
+            
+            if list(m.get_column(2)) == [3, 6] and t[0:2, 1:2].tolist() == [[4], [5]]:
+                print(f"✓ Columna y vista de vista ({nombre})")
+            else:
+                print(f"✗ Columna o vista de vista incorrecta ({nombre})")
+            
+            # Test copia al escribir
+            t[0, 0] = 100
+            if t[0, 0] == 100 and m[0, 0] == 1 and not t.is_view:
+                print(f"✓ Copia al escribir en la vista ({nombre})")
+            else:
+                print(f"✗ La escritura en la vista modificó la matriz original ({nombre})")
+        
+        a = Matrix([[1, 2], [3, 4], [5, 6]])
+        if matrix_multiply(a.T, a).tolist() == [[35, 44], [44, 56]]:
+            print("✓ A.T * A sin transpuesta intermedia")
+        else:
+            print("✗ A.T * A incorrecto")
+            
+    except Exception as e:
+        print(f"✗ Error en vistas: {e}")
+
+
+def test_backend_numpy():
+    """Paridad entre los backends "python" y "numpy" en las operaciones básicas."""
+    print("\nProbando backend numpy...")
+    
+    try:
+        import linAlg
+        from linAlg import (Matrix, Vector, dot_product, matrix_multiply, determinant,
+                            inverse, transpose, scale, add, subtract, set_backend)
+        
+        if linAlg.np is None:
+            print("- NumPy no está instalado; se omite la comparación")
+            return
+        
+        m1 = Matrix([[1, 2], [3, 4]])
+        m2 = Matrix([[5, 6], [7, 8]])
+        mf = Matrix([[4.0, 3.0, 0.0], [3.0, 4.0, -1.0], [0.0, -1.0, 4.0]])
+        grande = Matrix([[2 ** 62, 1], [1, 2 ** 62]])
+        negativa = Matrix([[-2 ** 62, 0], [0, -2 ** 62]])
+        casos = {
+            "dot_product": lambda: dot_product(Vector([3, 4]), Vector([1, 0])),
+            "matrix_multiply": lambda: matrix_multiply(m1, m2).tolist(),
+            "determinant": lambda: determinant(mf),
+            "determinant exacto": lambda: determinant(m1),
+            "inverse": lambda: inverse(mf).tolist(),
+            "transpose": lambda: transpose(m1).tolist(),
+            "scale": lambda: scale(m1, 2),
+            "add": lambda: add(m1, m2),
+            "subtract": lambda: subtract(m1, m2),
+            "add con Vector": lambda: add(m1, Vector([10, 20])),
+            "subtract con escalar": lambda: subtract(m1, 1),
+            "add sin desbordar int64": lambda: add(grande, grande),
+            "subtract sin desbordar int64": lambda: subtract(negativa, grande),
+        }
+        
+        def iguales(a, b):
+            if isinstance(a, list):
+                return len(a) == len(b) and all(iguales(x, y) for x, y in zip(a, b))
+            return type(a) == type(b) and abs(a - b) <= 1e-12 * max(1, abs(a))
+        
+        try:
+            for nombre, caso in casos.items():
+                set_backend("python")
+                esperado = caso()
+                set_backend("numpy")
+                obtenido = caso()
+                if iguales(esperado, obtenido):
+                    print(f"✓ {nombre}: {obtenido}")
+                else:
+                    print(f"✗ {nombre}: python {esperado} / numpy {obtenido}")
+        finally:
+            set_backend("python")
+            
+    except Exception as e:
+        print(f"✗ Error en backend numpy: {e}")
+
+
+def test_lotes():
+    """Pruebas de las operaciones por lotes contra las funciones escalares."""
+    print("\nProbando operaciones por lotes...")
+    
+    try:
+        import random
+        from linAlg import (MatrixBatch, VectorBatch, batch_matmul, batch_det, batch_inverse,
+                            batch_dot, batch_cross, matrix_multiply, determinant, inverse,
+                            dot_product, cross_product)
+        
+        rng = random.Random(0)
+        a = MatrixBatch([[[rng.uniform(-1, 1) for _ in range(3)] for _ in range(3)] for _ in range(100)])
+        b = MatrixBatch([[[rng.uniform(-1, 1) for _ in range(3)] for _ in range(3)] for _ in range(100)])
+        u = VectorBatch([[rng.uniform(-1, 1) for _ in range(3)] for _ in range(100)])
+        w = VectorBatch([[rng.uniform(-1, 1) for _ in range(3)] for _ in range(100)])
+        inferiores = MatrixBatch([[[rng.uniform(-1, 1) if j <= i else 0.0 for j in range(4)] for i in range(4)]
+                                  for _ in range(200)])
+        
+        productos = batch_matmul(a, b)
+        dets = batch_det(a)
+        inversas = batch_inverse(a)
+        puntos = batch_dot(u, w)
+        cruces = batch_cross(u, w)
+        
+        comparaciones = {
+            "batch_matmul": all(productos[k].tolist() == matrix_multiply(a[k], b[k]).tolist() for k in range(100)),
+            "batch_det": all(dets[k] == determinant(a[k]) for k in range(100)),
+            "batch_det triangular": all(d == determinant(inferiores[k]) for k, d in enumerate(batch_det(inferiores))),
+            "batch_inverse": all(inversas[k].tolist() == inverse(a[k]).tolist() for k in range(100)),
+            "batch_dot": all(puntos[k] == dot_product(u[k], w[k]) for k in range(100)),
+            "batch_cross": all(list(cruces[k]) == cross_product(u[k], w[k]) for k in range(100)),
+        }
+        for nombre, iguales in comparaciones.items():
+            if iguales:
+                print(f"✓ {nombre} coincide con la función escalar")
+            else:
+                print(f"✗ {nombre} no coincide con la función escalar")
+            
+    except Exception as e:
+        print(f"✗ Error en operaciones por lotes: {e}")
+
+
+def test_matriz_dispersa():
+    """Pruebas de SparseMatrix contra las operaciones densas."""
+    print("\nProbando matrices dispersas...")
+    
+    try:
+        from linAlg import Matrix, Vector, SparseMatrix, matrix_multiply, vector_multiply, add, scale
+        
+        densa = Matrix([[0, 2, 0], [1, 0, 0], [0, 0, 3]])
+        s = SparseMatrix([0, 1, 2, 2], [1, 0, 2, 2], [2, 1, 1, 2], (3, 3))
+        if s.nnz == 3 and s.to_dense() == densa:
+            print(f"✓ Construcción COO (duplicados sumados): {s!r}")
+        else:
+            print("✗ Construcción COO incorrecta")
+        
+        otra = Matrix([[1, 2], [3, 4], [5, 6]])
+        if (s * otra).tolist() == matrix_multiply(densa, otra).tolist() and s * Vector([1, 2, 3]) == vector_multiply(densa, Vector([1, 2, 3])):
+            print("✓ Producto disperso x denso y disperso x vector")
+        else:
+            print("✗ Productos dispersos incorrectos")
+        
+        if s.T.to_dense() == densa.T and (s + s).to_dense().tolist() == add(densa, densa) and scale(s, 2).to_dense().tolist() == scale(densa, 2):
+            print("✓ Transpuesta, suma y escalado dispersos")
+        else:
+            print("✗ Transpuesta, suma o escalado dispersos incorrectos")
+        
+        if SparseMatrix.from_dense(densa).to_dense() == densa:
+            print("✓ Conversión Matrix <-> SparseMatrix")
+        else:
+            print("✗ Conversión Matrix <-> SparseMatrix incorrecta")
+            
+    except Exception as e:
+        print(f"✗ Error en matrices dispersas: {e}")
+
+
+def test_paralelo():
+    """Pruebas de la ejecución en paralelo contra la ejecución en serie."""
+    print("\nProbando ejecución en paralelo...")
+    
+    try:
+        import linAlg
+        from linAlg import Matrix, matrix_multiply, get_cofactors_matrix, parallel
+        
+        a = Matrix([[float(i * j % 7) for j in range(12)] for i in range(10)])
+        b = Matrix([[float(i + j) / 3 for j in range(8)] for i in range(12)])
+        enteros = Matrix([[2, -1, 0, 3], [1, 4, 2, 0], [0, 1, 5, 1], [3, 0, 1, 2]])
+        en_serie = matrix_multiply(a, b)
+        cofactores = get_cofactors_matrix(enteros)
+
+        # Cuenta las veces que los cofactores se repartieron de verdad entre procesos
+        repartidos = []
+        original = linAlg._parallel_cofactors
+        def espia(matrix, workers):
+            filas = original(matrix, workers)
+            repartidos.append(filas is not None)
+            return filas
+        linAlg._parallel_cofactors = espia
+        try:
+            with parallel(workers=2, min_work=0):
+                en_paralelo = matrix_multiply(a, b)
+                cofactores_paralelo = get_cofactors_matrix(enteros)
+            cofactores_workers = get_cofactors_matrix(enteros, workers=2)
+        finally:
+            linAlg._parallel_cofactors = original
+        if en_paralelo == en_serie:
+            print("✓ matrix_multiply en paralelo igual a la ejecución en serie")
+        else:
+            print("✗ matrix_multiply en paralelo incorrecto")
+        
+        if (repartidos[0] and cofactores_paralelo == cofactores
+                and all(isinstance(x, int) for fila in cofactores_paralelo.data for x in fila)):
+            print("✓ Cofactores en paralelo exactos para enteros")
+        else:
+            print(f"✗ Cofactores en paralelo incorrectos (repartidos: {repartidos})")
+        
+        if not repartidos[1] and cofactores_workers == cofactores:
+            print("✓ Cofactores pequeños con workers=2 se calculan en serie con la caché de menores")
+        else:
+            print("✗ Error en cofactores con workers=2 bajo el umbral")
+        
+        if matrix_multiply(a, b, workers=2) == en_serie:
+            print("✓ Operación pequeña con workers=2 se ejecuta en serie")
+        else:
+            print("✗ Error con workers=2 bajo el umbral")
+            
+    except Exception as e:
+        print(f"✗ Error en ejecución en paralelo: {e}")
+
+
+def test_evaluacion_diferida():
+    """Pruebas de las expresiones diferidas contra la evaluación inmediata."""
+    print("\nProbando evaluación diferida...")
+    
+    try:
+        from linAlg import Matrix, Vector, Expression, lazy, matrix_multiply
+        
+        a = Matrix([[1, 2], [3, 4]])
+        b = Matrix([[5, 6], [7, 8]])
+        c = Matrix([[1, 0], [2, 1]])
+        with lazy():
+            expresion = a + b - c * 2
+        if isinstance(expresion, Expression) and expresion[0][0] == 4 and expresion.tolist() == [[4, 8], [6, 10]]:
+            print(f"✓ Expresión fusionada evaluada al primer acceso: {expresion.eval()}")
+        else:
+            print("✗ Evaluación de la expresión fusionada incorrecta")
+        
+        x = Matrix([[1, 2]] * 10)
+        y = Matrix([[1] * 10, [2] * 10])
+        z = Matrix([[3]] * 10)
+        cadena = (x.lazy * y * z).eval()
+        if cadena == matrix_multiply(matrix_multiply(x, y), z):
+            print("✓ Cadena de productos reordenada con el mismo resultado")
+        else:
+            print("✗ Cadena de productos incorrecta")
+        
+        v = (Vector([1, 2, 3]).lazy * 2 - Vector([1, 1, 1])).eval()
+        if isinstance(v, Vector) and list(v) == [1, 3, 5]:
+            print("✓ Expresión de vectores")
+        else:
+            print("✗ Expresión de vectores incorrecta")
+
+        # Difusión igual que en la evaluación inmediata: un Vector por fila, un escalar por entrada
+        m = Matrix([[1, 2, 3], [4, 5, 6]])
+        fila = Vector([10, 20, 30])
+        columna = Matrix([[1], [2]])
+        with lazy():
+            difundidas = [m + fila, m - 1, m + 2.5, columna + fila, 1 - (m + m)]
+        inmediatas = [m + fila, m - 1, m + 2.5, columna + fila, [[-1, -3, -5], [-7, -9, -11]]]
+        if all(d.tolist() == (i.tolist() if isinstance(i, Matrix) else i) for d, i in zip(difundidas, inmediatas)):
+            print("✓ Difusión de vectores y escalares en modo diferido")
+        else:
+            print(f"✗ Difusión en modo diferido incorrecta: {[d.tolist() for d in difundidas]}")
+
+    except Exception as e:
+        print(f"✗ Error en evaluación diferida: {e}")
+
+
+def test_instrumentacion():
+    """Pruebas del perfilado con profile()."""
+    print("\nProbando instrumentación...")
+    
+    try:
+        import os
+        import pstats
+        import sys
+        import tempfile
+        from linAlg import Matrix, get_cofactors_matrix, profile
+        
+        m = Matrix([[2, 1, 0], [1, 3, 1], [0, 1, 4]])
+        with profile() as p:
+            get_cofactors_matrix(m)
+        estadisticas = p.as_dict()
+        if estadisticas["get_det"]["calls"] == 9 and estadisticas["get_minor"]["calls"] == 9 and sys.getprofile() is None:
+            print(f"✓ Conteo de llamadas: get_det = {estadisticas['get_det']['calls']}, get_minor = {estadisticas['get_minor']['calls']}")
+        else:
+            print("✗ Conteo de llamadas incorrecto")
+        
+        ruta = os.path.join(tempfile.mkdtemp(), "linalg.prof")
+        p.dump_stats(ruta)
+        if pstats.Stats(ruta).total_calls == sum(e["calls"] for e in estadisticas.values()):
+            print("✓ Volcado compatible con pstats")
+        else:
+            print("✗ Volcado incompatible con pstats")
+            
+    except Exception as e:
+        print(f"✗ Error en instrumentación: {e}")
+
+
+def test_cache_menores():
+    """Pruebas de la caché de menores con entradas exactas."""
+    print("\nProbando caché de menores...")
+    
+    try:
+        from fractions import Fraction
+        from linAlg import Matrix, MinorCache, get_cofactors_matrix, get_det, get_minor
+        
+        m = [[2, -1, 0, 3], [1, 4, 2, 0], [0, 1, 5, 1], [3, 0, 1, 2]]
+        esperada = [[32, -15, 14, -55], [6, -27, 8, -13], [8, 7, -18, -3], [-52, 19, -12, 41]]
+        if get_cofactors_matrix(m).tolist() == esperada:
+            print("✓ Cofactores exactos con menores memoizados")
+        else:
+            print("✗ Cofactores exactos incorrectos")
+        
+        cache = MinorCache(m, maxsize=3)
+        if cache.determinant() == Matrix(m).determinant and len(cache) <= 3 and get_det(get_minor(m, 0, 0), cache) == 32:
+            print(f"✓ LRU acotada: {len(cache)} menores guardados, {cache.hits} aciertos")
+        else:
+            print("✗ Caché LRU incorrecta")
+        
+        fracciones = Matrix([[Fraction(1, 2), 1, 0], [0, Fraction(1, 3), 2], [1, 0, 1]])
+        if MinorCache(fracciones).determinant() == fracciones.determinant == Fraction(13, 6):
+            print("✓ Determinante exacto con Fraction")
+        else:
+            print("✗ Determinante con Fraction incorrecto")
+
+        cache = MinorCache(m)
+        permutada = Matrix([[fila[1], fila[0], fila[2], fila[3]] for fila in m])
+        if cache.determinant() == -86 and cache.determinant(columns=[1, 0, 2, 3]) == permutada.determinant == 86:
+            print("✓ El orden de las columnas cambia el signo del menor")
+        else:
+            print("✗ Signo incorrecto con columnas reordenadas")
+
+        reutilizada = Matrix([fila[:] for fila in m])
+        cache = MinorCache(reutilizada)
+        get_cofactors_matrix(reutilizada, cache=cache)
+        reutilizada[0, 0] = 7
+        if get_cofactors_matrix(reutilizada, cache=cache) == get_cofactors_matrix(reutilizada):
+            print("✓ La caché reutilizada toma los valores nuevos de la matriz")
+        else:
+            print("✗ La caché reutilizada usa valores viejos")
+
+    except Exception as e:
+        print(f"✗ Error en caché de menores: {e}")
+
+
+def test_nucleos_vector():
+    """Pruebas de magnitude, normalize y angle_between de un solo recorrido."""
+    print("\nProbando núcleos de vector...")
+    
+    try:
+        import math
+        from linAlg import Vector, magnitude, normalize, angle_between
+        
+        v = Vector([3, 4])
+        unitario = normalize(v)
+        if isinstance(unitario, Vector) and list(unitario) == [0.6, 0.8] and magnitude(v) == 5.0:
+            print(f"✓ normalize retorna Vector: {unitario}")
+        else:
+            print("✗ normalize o magnitude incorrectos")
+        
+        if magnitude(Vector([1e200, 1e200])) == math.hypot(1e200, 1e200):
+            print("✓ magnitude sin desborde para componentes grandes")
+        else:
+            print("✗ magnitude se desborda")
+        
+        ortogonal = angle_between(Vector([1, 0]), Vector([0, 2]))
+        nulo = angle_between(Vector([0, 0]), Vector([1, 1]))
+        if ortogonal == math.pi / 2 and isinstance(nulo, str) and angle_between(v, v * 1) == 0.0:
+            print(f"✓ angle_between de vectores ortogonales: {ortogonal}")
+        else:
+            print("✗ angle_between incorrecto")
+        
+        try:
+            v.otro = 1
+            print("✗ Vector acepta atributos nuevos (sin __slots__)")
+        except AttributeError:
+            print("✓ Vector usa __slots__")
+            
+    except Exception as e:
+        print(f"✗ Error en núcleos de vector: {e}")
+
+
+def test_matrices_en_disco():
+    """Pruebas de MappedMatrix contra las operaciones en memoria."""
+    print("\nProbando matrices en disco...")
+    
+    try:
+        import os
+        import tempfile
+        from linAlg import Matrix, MappedMatrix, matrix_multiply, transpose, scale, add
+        
+        carpeta = tempfile.mkdtemp()
+        a = Matrix([[float(i + 2 * j) for j in range(7)] for i in range(5)])
+        b = Matrix([[float(i * j % 3) for j in range(4)] for i in range(7)])
+        with MappedMatrix.from_matrix(a, os.path.join(carpeta, "a.mat")) as ma, \
+                MappedMatrix.from_matrix(b, os.path.join(carpeta, "b.mat")) as mb:
+            c = ma.matmul(mb, out=os.path.join(carpeta, "c.mat"), block=3)
+            iguales = c.to_matrix() == matrix_multiply(a, b)
+            c.close()
+            if iguales and MappedMatrix(os.path.join(carpeta, "c.mat")).shape == (5, 4):
+                print("✓ Producto por bloques escrito en un archivo mapeado")
+            else:
+                print("✗ Producto por bloques incorrecto")
+            
+            if (transpose(ma).to_matrix() == a.T and scale(ma, 2).to_matrix().tolist() == scale(a, 2)
+                    and add(ma, a).to_matrix().tolist() == add(a, a)):
+                print("✓ Transpuesta, escalado y suma por filas")
+            else:
+                print("✗ Transpuesta, escalado o suma incorrectos")
+            
+            if sum(len(filas) for _, filas in ma.row_blocks(2)) == 5 and ma[1, 2] == a[1][2]:
+                print(f"✓ Recorrido por bloques de filas: {ma!r}")
+            else:
+                print("✗ Recorrido por bloques incorrecto")
+            
+    except Exception as e:
+        print(f"✗ Error en matrices en disco: {e}")
+
+
+def test_serializacion():
+    """Pruebas de save/load para Matrix y Vector."""
+    print("\nProbando serialización...")
+    
+    try:
+        import os
+        import tempfile
+        from linAlg import Matrix, Vector, MappedMatrix
+        
+        carpeta = tempfile.mkdtemp()
+        a = Matrix([[float(i - 2 * j) / 3 for j in range(6)] for i in range(4)])
+        correctas = True
+        for compresion in (None, "zlib", "lzma"):
+            ruta = os.path.join(carpeta, f"a_{compresion}.mat")
+            a.save(ruta, compression=compresion)
+            correctas = correctas and Matrix.load(ruta) == a
+        if correctas and Matrix.load(os.path.join(carpeta, "a_None.mat"), mmap=True) == a:
+            print("✓ Ida y vuelta sin comprimir, con zlib, con lzma y mapeada")
+        else:
+            print("✗ La matriz cargada no coincide con la guardada")
+        
+        enteros = Matrix([[1, -2], [3, 4]])
+        enteros.save(os.path.join(carpeta, "e.mat"))
+        Vector([1.5, 2.0, -3.0]).save(os.path.join(carpeta, "v.mat"))
+        cargada = Matrix.load(os.path.join(carpeta, "e.mat"))
+        if (cargada.tolist() == [[1, -2], [3, 4]] and type(cargada[0][0]) is int
+                and list(Vector.load(os.path.join(carpeta, "v.mat"))) == [1.5, 2.0, -3.0]):
+            print("✓ Enteros exactos y vectores")
+        else:
+            print("✗ Enteros o vectores incorrectos")
+        
+        with MappedMatrix(os.path.join(carpeta, "a_None.mat")) as mapeada:
+            if mapeada.to_matrix() == a:
+                print("✓ MappedMatrix abre los archivos de save()")
+            else:
+                print("✗ MappedMatrix no lee el archivo de save()")
+        
+        a.save(os.path.join(carpeta, "a.npy"))
+        if Matrix.load(os.path.join(carpeta, "a.npy")) == a:
+            print("✓ Formato .npy")
+        else:
+            print("✗ Formato .npy incorrecto")
+        
+        try:
+            import numpy as np
+            np.save(os.path.join(carpeta, "f.npy"), np.asfortranarray(np.arange(6.0).reshape(2, 3)))
+            if (np.load(os.path.join(carpeta, "a.npy")).tolist() == a.tolist()
+                    and Matrix.load(os.path.join(carpeta, "f.npy")).tolist() == [[0, 1, 2], [3, 4, 5]]):
+                print("✓ Compatible con numpy.save/numpy.load")
+            else:
+                print("✗ Incompatible con NumPy")
+        except ImportError:
+            print("✓ NumPy no está instalado; se omite la comparación")
+        
+        try:
+            Vector.load(os.path.join(carpeta, "a_None.mat"))
+            print("✗ Debería rechazar una matriz al cargar un vector")
+        except ValueError:
+            print("✓ Rechaza archivos con otra cantidad de dimensiones")
+        
+    except Exception as e:
+        print(f"✗ Error en serialización: {e}")
+
+
 def ejecutar_todas_las_pruebas():
     """Ejecuta todas las pruebas básicas."""
     print("=" * 60)
@@ -178,7 +1033,25 @@ def ejecutar_todas_las_pruebas():
     test_matrix_basico()
     test_funciones_vector()
     test_funciones_matrix()
+    test_elemento_a_elemento()
     test_matrices_especiales()
+    test_determinante_lu()
+    test_inversa_lu()
+    test_sistemas_lineales()
+    test_metodos_iterativos()
+    test_estructura()
+    test_almacenamiento_compacto()
+    test_vistas()
+    test_backend_numpy()
+    test_lotes()
+    test_matriz_dispersa()
+    test_paralelo()
+    test_evaluacion_diferida()
+    test_instrumentacion()
+    test_cache_menores()
+    test_nucleos_vector()
+    test_matrices_en_disco()
+    test_serializacion()
     
     print("\n" + "=" * 60)
     print("PRUEBAS COMPLETADAS")
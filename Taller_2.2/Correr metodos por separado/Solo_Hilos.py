@@ -1,46 +1,18 @@
-import concurrent.futures
-import requests
-import threading
-import time
+"""
+Descarga con hilos de las imágenes del taller.
 
+Uso:
+    python Solo_Hilos.py --concurrency 10 --retries 2 --no-cache
+"""
 
-image_urls = [
-    "https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800",
-    "https://images.unsplash.com/photo-1441974231531-c6227db76b6e?w=800",
-    "https://images.unsplash.com/photo-1518837695005-2083093ee35b?w=800",
-    "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=800",
-    "https://images.unsplash.com/photo-1501594907352-04cda38ebc29?w=800",
-    "https://httpbin.org/image/png",
-    "https://httpbin.org/image/jpeg"
-] *25
+import os
+import sys
 
-thread_local = threading.local()
+# El motor de descargas está en la carpeta del taller
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-
-def get_session():
-    if not hasattr(thread_local, "session"):
-        thread_local.session = requests.Session()
-    return thread_local.session
-
-
-def download_site(url):
-    session = get_session()
-    with session.get(url) as response:
-        print(f"Read {len(response.content)} from {url}")
-
-
-def download_all_sites(sites):
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        executor.map(download_site, sites)
-
-
-def main():
-    sites = image_urls
-    start_time = time.time()
-    download_all_sites(sites)
-    duration = time.time() - start_time
-    print(f"Descarga con Hilos:{len(sites)} en {duration:.2f} segundos")
+from motor_descargas import main
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(strategy="threads")
@@ -0,0 +1,19 @@
+"""
+Descarga de las imágenes del taller con un pool de procesos, cada uno con su
+propio bucle de asyncio.
+
+Uso:
+    python Solo_hibrida.py --concurrency 20 --retries 2 --no-cache
+"""
+
+import os
+import sys
+
+# El motor de descargas está en la carpeta del taller
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor_descargas import main
+
+
+if __name__ == "__main__":
+    main(strategy="hybrid")
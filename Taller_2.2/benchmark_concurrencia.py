@@ -0,0 +1,287 @@
+"""
+Benchmark de concurrencia
+=========================
+
+Mide las estrategias de motor_descargas contra un servidor local que corre en
+otro proceso (servidor_local.ServerProcess): sin red ni DNS, y con latencia,
+jitter, tamaño de cuerpo y tasa de errores controlados.
+
+Para cada combinación de estrategia, concurrencia y tamaño de cuerpo se hacen
+`--warmup` ejecuciones que no se miden y `--repeat` ejecuciones medidas con
+perf_counter. Se reporta:
+
+- mediana, p95 y p99 de la latencia de cada solicitud (todas las ejecuciones medidas)
+- mediana del tiempo de cada ejecución, y con ella throughput en solicitudes/s
+- mediana de MB/s descargados con éxito por ejecución
+- mediana del tiempo de CPU del cliente por ejecución (incluye hilos y procesos hijos)
+
+Los resultados se guardan en JSON y CSV junto con un gráfico comparativo.
+
+Uso:
+    python benchmark_concurrencia.py
+    python benchmark_concurrencia.py --strategies threads asyncio hybrid --concurrency 1 8 32 \\
+        --payloads 1024 262144 --requests 200 --latency 0.02 --jitter 0.005 --error-rate 0.01
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urlencode
+
+from motor_descargas import available_strategies, fetch_all
+from servidor_local import ServerProcess
+
+
+@dataclass
+class BenchmarkResult:
+    """Mediciones de una estrategia con una concurrencia y un tamaño de cuerpo."""
+    strategy: str
+    concurrency: int
+    payload: int
+    requests: int
+    latency: float
+    jitter: float
+    error_rate: float
+    warmup: int
+    repeat: int
+    median_seconds: float = 0.0
+    latency_median: float = 0.0
+    latency_p95: float = 0.0
+    latency_p99: float = 0.0
+    throughput: float = 0.0
+    megabytes_per_second: float = 0.0
+    cpu_seconds: float = 0.0
+    errors: int = 0
+    run_seconds: list = field(default_factory=list)
+
+
+def percentile(values, q: float) -> float:
+    """
+    Percentil q (0 a 100) con interpolación lineal entre los valores vecinos.
+
+    Args:
+        values: Valores (no necesitan estar ordenados)
+        q: Percentil
+
+    Returns:
+        El percentil, o 0.0 si no hay valores
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def cpu_time() -> float:
+    """Segundos de CPU (usuario + sistema) de este proceso y de sus hijos ya terminados."""
+    # process_time tiene más resolución que os.times, que solo sirve para los hijos
+    times = os.times()
+    return time.process_time() + times.children_user + times.children_system
+
+
+def case_url(server, payload: int, latency: float, jitter: float, error_rate: float) -> str:
+    """URL del servidor local con la latencia, el jitter y la tasa de errores pedidos."""
+    query = {name: value for name, value in
+             (("delay", latency), ("jitter", jitter), ("error_rate", error_rate)) if value}
+    return server.url(f"/bytes/{payload}" + (f"?{urlencode(query)}" if query else ""))
+
+
+def case_urls(server, payload: int, args) -> list:
+    """
+    Las args.requests URLs de una ejecución, todas distintas.
+
+    El servidor ignora el parámetro i; como ninguna URL se repite, las
+    estrategias no pueden agrupar copias y se mide su concurrencia, no su
+    manejo de duplicados.
+    """
+    url = case_url(server, payload, args.latency, args.jitter, args.error_rate)
+    separator = "&" if "?" in url else "?"
+    return [f"{url}{separator}i={n}" for n in range(args.requests)]
+
+
+def run_case(server, strategy: str, concurrency: int, payload: int, args) -> BenchmarkResult:
+    """Ejecuta una combinación con calentamiento y repeticiones medidas."""
+    urls = case_urls(server, payload, args)
+    result = BenchmarkResult(strategy, concurrency, payload, args.requests, args.latency,
+                             args.jitter, args.error_rate, args.warmup, args.repeat)
+
+    def run():
+        return fetch_all(urls, strategy=strategy, concurrency=concurrency, retries=args.retries,
+                         timeout=args.timeout)
+
+    for _ in range(args.warmup):
+        run()
+    latencies = []
+    cpu = []
+    rates = []
+    for _ in range(args.repeat):
+        cpu_start = cpu_time()
+        start = time.perf_counter()
+        downloads = run()
+        result.run_seconds.append(time.perf_counter() - start)
+        cpu.append(cpu_time() - cpu_start)
+        latencies.extend(d.seconds for d in downloads)
+        result.errors += sum(not d.ok for d in downloads)
+        rates.append(sum(d.size for d in downloads) / result.run_seconds[-1] / 1e6)
+
+    result.median_seconds = statistics.median(result.run_seconds)
+    result.latency_median = percentile(latencies, 50)
+    result.latency_p95 = percentile(latencies, 95)
+    result.latency_p99 = percentile(latencies, 99)
+    result.throughput = args.requests / result.median_seconds
+    result.megabytes_per_second = statistics.median(rates)
+    result.cpu_seconds = statistics.median(cpu)
+    return result
+
+
+def sweep(args, on_result=None) -> list:
+    """
+    Recorre estrategias, niveles de concurrencia y tamaños de cuerpo.
+
+    sync se mide solo con concurrencia 1 (no tiene otra).
+
+    Args:
+        args: Opciones de la línea de comandos (ver build_parser)
+        on_result: Función que recibe cada BenchmarkResult al terminar
+
+    Returns:
+        Lista de BenchmarkResult
+    """
+    results = []
+    with ServerProcess(seed=args.seed) as server:
+        for payload in args.payloads:
+            for strategy in args.strategies:
+                levels = [1] if strategy == "sync" else args.concurrency
+                for concurrency in levels:
+                    result = run_case(server, strategy, concurrency, payload, args)
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+    return results
+
+
+# =============================================================================
+# SALIDA
+# =============================================================================
+
+_COLUMNS = ["strategy", "concurrency", "payload", "requests", "latency", "jitter", "error_rate",
+            "warmup", "repeat", "median_seconds", "latency_median", "latency_p95", "latency_p99",
+            "throughput", "megabytes_per_second", "cpu_seconds", "errors"]
+
+
+def write_json(results: list, path: str):
+    """Guarda los resultados (incluidos los tiempos de cada ejecución) en JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([asdict(r) for r in results], f, indent=2)
+
+
+def write_csv(results: list, path: str):
+    """Guarda los resultados en CSV, una fila por combinación."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for result in results:
+            writer.writerow(asdict(result))
+
+
+def plot(results: list, path: str):
+    """
+    Gráfico comparativo: throughput y latencia p95 según la concurrencia,
+    una columna por tamaño de cuerpo y una línea por estrategia.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    payloads = sorted({r.payload for r in results})
+    strategies = list(dict.fromkeys(r.strategy for r in results))
+    figure, axes = plt.subplots(2, len(payloads), figsize=(5 * len(payloads), 8), squeeze=False)
+    for column, payload in enumerate(payloads):
+        for strategy in strategies:
+            points = sorted((r.concurrency, r.throughput, r.latency_p95) for r in results
+                            if r.payload == payload and r.strategy == strategy)
+            if not points:
+                continue
+            levels, throughput, p95 = zip(*points)
+            if len(points) == 1:
+                # sync: una sola medición, se dibuja como referencia horizontal
+                axes[0][column].axhline(throughput[0], linestyle="--", color="gray", label=strategy)
+                axes[1][column].axhline(p95[0] * 1000, linestyle="--", color="gray", label=strategy)
+            else:
+                axes[0][column].plot(levels, throughput, marker="o", label=strategy)
+                axes[1][column].plot(levels, [v * 1000 for v in p95], marker="o", label=strategy)
+        axes[0][column].set_title(f"cuerpo de {payload} bytes")
+        axes[0][column].set_ylabel("solicitudes / s")
+        axes[1][column].set_ylabel("latencia p95 (ms)")
+        for row in (0, 1):
+            axes[row][column].set_xscale("log", base=2)
+            axes[row][column].set_xlabel("concurrencia")
+            axes[row][column].grid(True, alpha=0.3)
+        axes[0][column].legend()
+    figure.tight_layout()
+    figure.savefig(path, dpi=100)
+    plt.close(figure)
+
+
+def print_result(result: BenchmarkResult):
+    """Muestra una fila de la tabla de resultados."""
+    print(f"{result.strategy:<16} {result.concurrency:>5} {result.payload:>9} "
+          f"{result.median_seconds:>9.3f} {result.latency_median * 1000:>8.1f} "
+          f"{result.latency_p95 * 1000:>8.1f} {result.latency_p99 * 1000:>8.1f} "
+          f"{result.throughput:>9.1f} {result.megabytes_per_second:>8.2f} "
+          f"{result.cpu_seconds:>8.3f} {result.errors:>7}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Parser de las opciones del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de las estrategias de descarga contra un servidor local")
+    parser.add_argument("--strategies", nargs="+", choices=available_strategies(),
+                        default=["sync", "threads", "asyncio", "multiprocessing", "hybrid"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64],
+                        help="Niveles de concurrencia a recorrer")
+    parser.add_argument("--payloads", type=int, nargs="+", default=[1024, 65536],
+                        help="Tamaños de cuerpo en bytes")
+    parser.add_argument("--requests", type=int, default=100, help="Solicitudes por ejecución")
+    parser.add_argument("--latency", type=float, default=0.02, help="Latencia del servidor en segundos")
+    parser.add_argument("--jitter", type=float, default=0.005,
+                        help="Variación uniforme de la latencia en segundos (±)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fracción de solicitudes que responden 503")
+    parser.add_argument("--warmup", type=int, default=1, help="Ejecuciones de calentamiento (no medidas)")
+    parser.add_argument("--repeat", type=int, default=5, help="Ejecuciones medidas")
+    parser.add_argument("--retries", type=int, default=0, help="Reintentos por solicitud")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Tiempo máximo por solicitud")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla del jitter y de los errores")
+    parser.add_argument("--output", default="resultados_benchmark",
+                        help="Directorio de benchmark.json, benchmark.csv y benchmark.png")
+    parser.add_argument("--no-plot", action="store_true", help="No generar el gráfico")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.repeat < 1 or args.requests < 1:
+        raise SystemExit("--repeat y --requests deben ser al menos 1")
+
+    print(f"{'estrategia':<16} {'conc':>5} {'bytes':>9} {'mediana s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'req/s':>9} {'MB/s':>8} {'CPU s':>8} {'errores':>7}")
+    print("-" * 107)
+    results = sweep(args, on_result=print_result)
+
+    os.makedirs(args.output, exist_ok=True)
+    write_json(results, os.path.join(args.output, "benchmark.json"))
+    write_csv(results, os.path.join(args.output, "benchmark.csv"))
+    if not args.no_plot:
+        plot(results, os.path.join(args.output, "benchmark.png"))
+    print(f"\nResultados guardados en {args.output}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+"""
+Caché de descargas
+==================
+
+Evita descargar dos veces el mismo recurso:
+
+- Agrupación de solicitudes en curso: si varias tareas o hilos piden la misma
+  URL a la vez, solo la primera va a la red y las demás esperan su resultado.
+- Caché en disco direccionada por contenido: cada cuerpo se guarda una sola
+  vez con el SHA-256 de su contenido como nombre, y cada URL apunta a su
+  cuerpo con un archivo de referencia que guarda ETag y Last-Modified.
+- Revalidación: una entrada vencida se pide con If-None-Match /
+  If-Modified-Since y, si el servidor responde 304, se reutiliza sin
+  descargar el cuerpo.
+- Expulsión LRU por tamaño: si los cuerpos superan max_bytes se eliminan las
+  URLs usadas hace más tiempo (la fecha de modificación de la referencia es
+  la del último uso).
+
+Estructura del directorio:
+    objects/ab/abcdef...   cuerpos, por hash de contenido
+    refs/0123...json       una referencia por URL
+
+Varias instancias (por ejemplo una por proceso) pueden compartir el
+directorio: todos los archivos se escriben en un temporal y se renombran. La
+agrupación de solicitudes y los contadores son de cada instancia.
+
+Ejemplo:
+    cache = ResponseCache("descargas")
+    with requests.Session() as session:
+        entry = cache.get(session, url)      # red
+        entry = cache.get(session, url)      # disco
+    print(cache.stats, cache.read(entry)[:10])
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+# Directorio por defecto de la caché (junto a este archivo)
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_descargas")
+
+# Tamaño máximo por defecto de los cuerpos guardados
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Segundos que una entrada sirve sin revalidar si la respuesta no trae Cache-Control: max-age
+DEFAULT_MAX_AGE = 300.0
+
+# Tamaño de los tramos de lectura y escritura
+CHUNK_SIZE = 64 * 1024
+
+_MAX_AGE = re.compile(r"max-age\s*=\s*(\d+)")
+
+
+@dataclass
+class CacheEntry:
+    """Referencia de una URL a su cuerpo guardado."""
+    url: str
+    digest: str
+    size: int
+    status: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored: float
+    max_age: Optional[float]
+
+
+@dataclass
+class CacheStats:
+    """Contadores de una ResponseCache."""
+    hits: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+
+
+class _ObjectWriter:
+    """Escribe un cuerpo en un temporal calculando su hash; commit() lo deja en su lugar."""
+
+    def __init__(self, cache: "ResponseCache"):
+        self._cache = cache
+        self._hash = hashlib.sha256()
+        self.size = 0
+        descriptor, self._temporary = tempfile.mkstemp(dir=cache._objects, suffix=".part")
+        self._file = os.fdopen(descriptor, "wb")
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> tuple:
+        """Mueve el cuerpo a objects/. Returns: (digest, True si el cuerpo es nuevo)"""
+        self._file.close()
+        digest = self._hash.hexdigest()
+        path = self._cache._object_path(digest)
+        if os.path.exists(path):
+            # Mismo contenido ya guardado (por otra URL o en otra ejecución)
+            os.unlink(self._temporary)
+            return digest, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self._temporary, path)
+        return digest, True
+
+    def abort(self):
+        self._file.close()
+        os.unlink(self._temporary)
+
+
+def _header_max_age(headers) -> Optional[float]:
+    """Segundos de validez según Cache-Control (no-cache y no-store obligan a revalidar), o None."""
+    control = headers.get("Cache-Control", "")
+    if "no-cache" in control or "no-store" in control:
+        return 0.0
+    match = _MAX_AGE.search(control)
+    return float(match.group(1)) if match else None
+
+
+class ResponseCache:
+    """
+    Caché de respuestas HTTP en disco con agrupación de solicitudes en curso.
+
+    get() recibe una requests.Session y agrupa entre hilos; get_async() recibe
+    una aiohttp.ClientSession y agrupa entre tareas. Ambos retornan un
+    CacheEntry cuyo cuerpo se lee con read() u open(). Las respuestas con
+    estado >= 400 no se guardan: el error se lanza a todos los que esperaban.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age: float = DEFAULT_MAX_AGE):
+        """
+        Args:
+            directory: Directorio de la caché (se crea si no existe)
+            max_bytes: Tamaño máximo de los cuerpos guardados
+            max_age: Segundos de validez de las respuestas sin Cache-Control: max-age
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = CacheStats()
+        self._objects = os.path.join(directory, "objects")
+        self._refs = os.path.join(directory, "refs")
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._refs, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._pending_async = {}
+        self._bytes = None
+
+    # ---------------------------------------------------------------- disco
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self._objects, digest[:2], digest)
+
+    def _ref_path(self, url: str) -> str:
+        return os.path.join(self._refs, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Retorna la entrada guardada de una URL (vigente o no) o None."""
+        try:
+            with open(self._ref_path(url), encoding="utf-8") as f:
+                entry = CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        if entry.url != url or not os.path.exists(self._object_path(entry.digest)):
+            return None
+        return entry
+
+    def fresh(self, entry: CacheEntry) -> bool:
+        """Indica si una entrada puede usarse sin revalidar."""
+        max_age = self.max_age if entry.max_age is None else entry.max_age
+        return time.time() - entry.stored < max_age
+
+    def open(self, entry: CacheEntry):
+        """Abre el cuerpo de una entrada en modo binario."""
+        return open(self._object_path(entry.digest), "rb")
+
+    def read(self, entry: CacheEntry) -> bytes:
+        """Retorna el cuerpo de una entrada."""
+        with self.open(entry) as f:
+            return f.read()
+
+    def _write_ref(self, entry: CacheEntry):
+        descriptor, temporary = tempfile.mkstemp(dir=self._refs, suffix=".part")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            json.dump(asdict(entry), f)
+        os.replace(temporary, self._ref_path(entry.url))
+
+    def _touch(self, entry: CacheEntry):
+        # La fecha de modificación de la referencia es la del último uso (para LRU)
+        try:
+            os.utime(self._ref_path(entry.url))
+        except OSError:
+            pass
+
+    def _store(self, url: str, status: int, headers, writer: _ObjectWriter) -> CacheEntry:
+        digest, new = writer.commit()
+        entry = CacheEntry(url, digest, writer.size, status, headers.get("ETag"),
+                           headers.get("Last-Modified"), time.time(),
+                           _header_max_age(headers))
+        self._write_ref(entry)
+        with self._lock:
+            if self._bytes is not None and new:
+                self._bytes += entry.size
+        if new and self.size() > self.max_bytes:
+            self._evict(self.max_bytes, keep=entry.url)
+        return entry
+
+    def _revalidate(self, entry: CacheEntry, headers) -> CacheEntry:
+        entry.stored = time.time()
+        entry.max_age = _header_max_age(headers)
+        entry.etag = headers.get("ETag", entry.etag)
+        entry.last_modified = headers.get("Last-Modified", entry.last_modified)
+        self._write_ref(entry)
+        return entry
+
+    def _validators(self, entry: Optional[CacheEntry]) -> dict:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _scan(self) -> tuple:
+        """Retorna (referencias [(último uso, ruta, entrada)], {digest: tamaño})."""
+        refs = []
+        for name in os.listdir(self._refs):
+            path = os.path.join(self._refs, name)
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    entry = CacheEntry(**json.load(f))
+                refs.append((os.path.getmtime(path), path, entry))
+            except (OSError, ValueError, TypeError):
+                continue
+        objects = {}
+        for folder in os.listdir(self._objects):
+            folder_path = os.path.join(self._objects, folder)
+            if os.path.isdir(folder_path):
+                for digest in os.listdir(folder_path):
+                    try:
+                        objects[digest] = os.path.getsize(os.path.join(folder_path, digest))
+                    except OSError:
+                        continue
+        return refs, objects
+
+    def size(self) -> int:
+        """Bytes ocupados por los cuerpos guardados."""
+        with self._lock:
+            if self._bytes is not None:
+                return self._bytes
+        _, objects = self._scan()
+        with self._lock:
+            self._bytes = sum(objects.values())
+            return self._bytes
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Elimina las URLs usadas hace más tiempo hasta que los cuerpos quepan en max_bytes.
+
+        Args:
+            max_bytes: Límite a aplicar (por defecto el de la caché)
+
+        Returns:
+            Número de URLs eliminadas
+        """
+        return self._evict(self.max_bytes if max_bytes is None else max_bytes)
+
+    def _evict(self, limit: int, keep: Optional[str] = None) -> int:
+        # keep: URL recién guardada, que no se elimina aunque sola supere el límite
+        refs, objects = self._scan()
+        refs.sort(key=lambda item: item[0])
+        users = {}
+        for _, _, entry in refs:
+            users[entry.digest] = users.get(entry.digest, 0) + 1
+        # Cuerpos sin referencia (restos de otra instancia) se borran primero
+        for digest in [d for d in objects if d not in users]:
+            self._remove_object(digest)
+            del objects[digest]
+        total = sum(objects.values())
+        evicted = 0
+        for _, path, entry in refs:
+            if total <= limit:
+                break
+            if entry.url == keep:
+                continue
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            evicted += 1
+            users[entry.digest] -= 1
+            if users[entry.digest] == 0 and entry.digest in objects:
+                self._remove_object(entry.digest)
+                total -= objects.pop(entry.digest)
+        with self._lock:
+            self._bytes = total
+            self.stats.evictions += evicted
+        return evicted
+
+    def _remove_object(self, digest: str):
+        try:
+            os.unlink(self._object_path(digest))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Elimina todas las entradas y cuerpos."""
+        self._evict(-1)
+
+    # --------------------------------------------------------------- descargas
+
+    def get(self, session, url: str) -> CacheEntry:
+        """
+        Retorna la entrada de una URL descargándola con requests solo si hace falta.
+
+        Si otro hilo ya está descargando la misma URL, espera su resultado en
+        lugar de repetir la solicitud.
+
+        Args:
+            session: requests.Session
+            url: URL a descargar
+
+        Returns:
+            Un CacheEntry
+        """
+        with self._lock:
+            future = self._pending.get(url)
+            owner = future is None
+            if owner:
+                future = self._pending[url] = Future()
+            else:
+                self.stats.coalesced += 1
+        if not owner:
+            return future.result()
+        try:
+            entry = self._fetch(session, url)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(entry)
+            return entry
+        finally:
+            with self._lock:
+                del self._pending[url]
+
+    def _fetch(self, session, url: str) -> CacheEntry:
+        entry = self.lookup(url)
+        if entry is not None and self.fresh(entry):
+            self._touch(entry)
+            self._count("hits")
+            return entry
+        with session.get(url, headers=self._validators(entry), stream=True) as response:
+            if response.status_code == 304 and entry is not None:
+                self._count("revalidated")
+                return self._revalidate(entry, response.headers)
+            response.raise_for_status()
+            writer = _ObjectWriter(self)
+            try:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    writer.write(chunk)
+            except BaseException:
+                writer.abort()
+                raise
+            self._count("misses")
+            return self._store(url, response.status_code, response.headers, writer)
+
+    async def get_async(self, session, url: str) -> CacheEntry:
+        """
+        Versión asíncrona de get() para aiohttp.ClientSession.
+
+        Las tareas que piden una URL que ya se está descargando esperan la
+        misma descarga. Cancelar a quien espera no cancela la descarga común.
+        """
+        loop = asyncio.get_running_loop()
+        task = self._pending_async.get(url)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch_async(session, url))
+            self._pending_async[url] = task
+            task.add_done_callback(lambda done: self._pending_async.pop(url, None)
+                                   if self._pending_async.get(url) is done else None)
+        else:
+            self._count("coalesced")
+        return await asyncio.shield(task)
+
+    async def _fetch_async(self, session, url: str) -> CacheEntry:
+        entry = self.lookup(url)
+        if entry is not None and self.fresh(entry):
+            self._touch(entry)
+            self._count("hits")
+            return entry
+        async with session.get(url, headers=self._validators(entry)) as response:
+            if response.status == 304 and entry is not None:
+                self._count("revalidated")
+                return self._revalidate(entry, response.headers)
+            response.raise_for_status()
+            writer = _ObjectWriter(self)
+            try:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    writer.write(chunk)
+            except BaseException:
+                writer.abort()
+                raise
+            self._count("misses")
+            return self._store(url, response.status, response.headers, writer)
+
+
+def body_size(session, url: str, cache: Optional[ResponseCache] = None) -> int:
+    """
+    Bytes del cuerpo de una URL descargada con requests.
+
+    Args:
+        session: requests.Session
+        url: URL a descargar
+        cache: ResponseCache opcional; sin ella se descarga siempre
+
+    Returns:
+        Tamaño del cuerpo en bytes
+    """
+    if cache is None:
+        with session.get(url) as response:
+            return len(response.content)
+    return cache.get(session, url).size
@@ -0,0 +1,258 @@
+"""
+Descargas asíncronas con concurrencia acotada
+=============================================
+
+Motor de descargas con asyncio/aiohttp pensado para listas muy largas:
+
+- Un número fijo de tareas (workers) toma las URLs de una cola acotada, así
+  que nunca hay más de `concurrency` solicitudes en curso ni más de
+  `concurrency` URLs esperando en memoria, sin importar el largo de la lista.
+- aiohttp.TCPConnector limita las conexiones totales y por host.
+- Los cuerpos se leen en tramos y se escriben en disco o se entregan a una
+  función, sin guardar la respuesta completa en memoria.
+
+Ejemplo:
+    resumen = asyncio.run(download_all(urls, concurrency=20, limit_per_host=5, sink="descargas"))
+"""
+
+import asyncio
+import hashlib
+import inspect
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Union
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Tamaño de los tramos en que se lee cada cuerpo
+CHUNK_SIZE = 64 * 1024
+
+# Descargas simultáneas por defecto
+DEFAULT_CONCURRENCY = 10
+
+
+@dataclass
+class DownloadResult:
+    """Resultado de la descarga de una URL."""
+    url: str
+    status: Optional[int]
+    size: int
+    seconds: float
+    path: Optional[str] = None
+    error: Optional[str] = None
+    retries: int = 0
+    worker: str = ""
+
+    @property
+    def ok(self) -> bool:
+        """Indica si la descarga terminó sin error."""
+        return self.error is None
+
+
+@dataclass
+class DownloadSummary:
+    """Totales de una ejecución de download_all."""
+    completed: int = 0
+    failed: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    max_in_flight: int = 0
+
+
+def file_name(url: str) -> str:
+    """Nombre de archivo estable para una URL: hash de la URL más la extensión de su ruta."""
+    extension = os.path.splitext(urlsplit(url).path)[1][:8]
+    return hashlib.sha1(url.encode()).hexdigest()[:20] + extension
+
+
+async def _write_chunks(chunks, url: str, sink):
+    """
+    Entrega los tramos de un cuerpo (iterable asíncrono) al destino.
+
+    Returns:
+        (bytes leídos, ruta del archivo escrito o None)
+    """
+    size = 0
+    if sink is None or callable(sink):
+        is_async = inspect.iscoroutinefunction(sink)
+        async for chunk in chunks:
+            size += len(chunk)
+            if is_async:
+                await sink(url, chunk)
+            elif sink is not None:
+                sink(url, chunk)
+        return size, None
+
+    # Directorio: se escribe en un temporal y se renombra al terminar, así un
+    # archivo a medias nunca queda con el nombre final
+    path = os.path.join(sink, file_name(url))
+    descriptor, temporary = tempfile.mkstemp(dir=sink, suffix=".part")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            async for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return size, path
+
+
+async def _cached_chunks(cache, entry, chunk_size: int):
+    """Tramos del cuerpo de una entrada de la caché."""
+    with cache.open(entry) as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def is_retryable(status: Optional[int]) -> bool:
+    """Indica si vale la pena reintentar una descarga fallida con este estado (None: error de red)."""
+    return status is None or status == 429 or status >= 500 or status < 400
+
+
+async def fetch(session: aiohttp.ClientSession, url: str, sink=None,
+                chunk_size: int = CHUNK_SIZE, cache=None, retries: int = 0,
+                backoff: float = 0.5) -> DownloadResult:
+    """
+    Descarga una URL leyendo el cuerpo en tramos.
+
+    Los errores de red, de tiempo o de estado HTTP (>= 400) no se lanzan:
+    quedan en el campo error del resultado. Los errores de red, 429 y 5xx se
+    reintentan hasta `retries` veces, esperando backoff, 2*backoff, 4*backoff...
+    (una función sink puede recibir los tramos de un intento fallido).
+
+    Args:
+        session: Sesión de aiohttp
+        url: URL a descargar
+        sink: None (solo contar bytes), un directorio o una función sink(url, tramo)
+        chunk_size: Tamaño de los tramos
+        cache: ResponseCache opcional; el cuerpo se toma de ella o se guarda en ella
+        retries: Reintentos máximos
+        backoff: Espera antes del primer reintento en segundos
+
+    Returns:
+        Un DownloadResult (seconds incluye los reintentos)
+    """
+    start = time.perf_counter()
+    attempt = 0
+    while True:
+        result = await _fetch_once(session, url, sink, chunk_size, cache)
+        if result.ok or attempt >= retries or not is_retryable(result.status):
+            result.seconds = time.perf_counter() - start
+            result.retries = attempt
+            return result
+        await asyncio.sleep(backoff * 2 ** attempt)
+        attempt += 1
+
+
+async def _fetch_once(session, url: str, sink, chunk_size: int, cache) -> DownloadResult:
+    start = time.perf_counter()
+    status = None
+    try:
+        if cache is not None:
+            entry = await cache.get_async(session, url)
+            status = entry.status
+            if sink is None:
+                size, path = entry.size, None
+            else:
+                size, path = await _write_chunks(_cached_chunks(cache, entry, chunk_size), url, sink)
+            return DownloadResult(url, status, size, time.perf_counter() - start, path)
+        async with session.get(url) as response:
+            status = response.status
+            response.raise_for_status()
+            size, path = await _write_chunks(response.content.iter_chunked(chunk_size), url, sink)
+        return DownloadResult(url, status, size, time.perf_counter() - start, path)
+    except aiohttp.ClientResponseError as e:
+        return DownloadResult(url, e.status, 0, time.perf_counter() - start,
+                              error=f"{type(e).__name__}: {e}")
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+        return DownloadResult(url, status, 0, time.perf_counter() - start,
+                              error=f"{type(e).__name__}: {e}")
+
+
+async def download_all(urls: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY,
+                       limit_per_host: int = 0, sink: Union[None, str, Callable] = None,
+                       chunk_size: int = CHUNK_SIZE, timeout: Optional[float] = 60.0,
+                       on_result: Optional[Callable[[DownloadResult], None]] = None,
+                       cache=None, retries: int = 0, backoff: float = 0.5) -> DownloadSummary:
+    """
+    Descarga todas las URLs con a lo sumo `concurrency` solicitudes en curso.
+
+    Las URLs se consumen del iterable a medida que hay workers libres (la cola
+    entre ambos está acotada), así que el iterable puede ser un generador de
+    cualquier largo y la memoria usada no crece con él. Los resultados no se
+    acumulan: se entregan uno a uno a on_result.
+
+    Args:
+        urls: Iterable de URLs
+        concurrency: Máximo de descargas simultáneas (y de conexiones abiertas)
+        limit_per_host: Máximo de conexiones simultáneas a un mismo host (0 sin límite)
+        sink: None (solo contar bytes), un directorio donde guardar cada cuerpo,
+            o una función sink(url, tramo) (puede ser async) que recibe los tramos
+        chunk_size: Tamaño de los tramos de lectura
+        timeout: Tiempo máximo por solicitud en segundos (None sin límite)
+        on_result: Función que recibe cada DownloadResult al terminar
+        cache: ResponseCache opcional (cache_descargas): las URLs repetidas o ya
+            guardadas se sirven de ella y las que están en curso se descargan una vez
+        retries: Reintentos máximos por URL (ver fetch)
+        backoff: Espera antes del primer reintento en segundos
+
+    Returns:
+        Un DownloadSummary con los totales
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency debe ser al menos 1")
+    if isinstance(sink, (str, os.PathLike)):
+        os.makedirs(sink, exist_ok=True)
+
+    summary = DownloadSummary()
+    queue = asyncio.Queue(maxsize=concurrency)
+    in_flight = 0
+
+    async def worker(session, name):
+        nonlocal in_flight
+        while True:
+            url = await queue.get()
+            if url is None:
+                return
+            in_flight += 1
+            summary.max_in_flight = max(summary.max_in_flight, in_flight)
+            try:
+                result = await fetch(session, url, sink, chunk_size, cache, retries, backoff)
+            finally:
+                in_flight -= 1
+            result.worker = name
+            if result.ok:
+                summary.completed += 1
+                summary.bytes += result.size
+            else:
+                summary.failed += 1
+            if on_result is not None:
+                on_result(result)
+
+    async def produce():
+        # put() espera cuando la cola está llena: el iterable avanza al ritmo de las descargas
+        for url in urls:
+            await queue.put(url)
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    start = time.perf_counter()
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=limit_per_host)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(worker(session, f"asyncio-{i}")) for i in range(concurrency)]
+        try:
+            # Si un worker falla (por ejemplo en on_result) el error se propaga en
+            # lugar de dejar al productor esperando una cola que nadie vacía
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+    summary.seconds = time.perf_counter() - start
+    return summary
@@ -0,0 +1,475 @@
+"""
+Motor de descargas
+==================
+
+Una sola API para las formas de descargar que compara el taller:
+
+    resultados = fetch_all(urls, strategy="threads", concurrency=8, sink="descargas")
+
+Cada estrategia es un plugin registrado con @register_strategy y todas
+entregan el mismo registro, un DownloadResult de descarga_async: url, status,
+size (bytes), seconds (latencia), retries y worker (hilo, proceso o tarea que
+la descargó).
+
+Estrategias incluidas:
+    sync             una solicitud a la vez con requests
+    threads          ThreadPoolExecutor con una sesión de requests por hilo
+    asyncio          descarga_async.download_all (cola acotada de workers)
+    multiprocessing  multiprocessing.Pool con una sesión de requests por proceso
+    hybrid           un pool de procesos, cada uno con su propio bucle de asyncio:
+                     la E/S se superpone dentro de cada proceso y el trabajo de
+                     CPU del sink se reparte entre los núcleos
+
+Los scripts Concurrencia_comparacion.py y Correr metodos por separado/Solo_*.py
+son envolturas de línea de comandos sobre este módulo (ver build_parser y main).
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field, replace
+from functools import partial
+from typing import Callable, Iterable, Optional, Union
+
+import requests
+
+from cache_descargas import DEFAULT_DIRECTORY, ResponseCache
+from descarga_async import (CHUNK_SIZE, DEFAULT_CONCURRENCY, DownloadResult, download_all,
+                            file_name, is_retryable)
+
+# URLs que descargan los scripts del taller: 7 imágenes repetidas 25 veces
+IMAGE_URLS = [
+    "https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800",
+    "https://images.unsplash.com/photo-1441974231531-c6227db76b6e?w=800",
+    "https://images.unsplash.com/photo-1518837695005-2083093ee35b?w=800",
+    "https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?w=800",
+    "https://images.unsplash.com/photo-1501594907352-04cda38ebc29?w=800",
+    "https://httpbin.org/image/png",
+    "https://httpbin.org/image/jpeg"
+] * 25
+
+
+@dataclass
+class FetchConfig:
+    """Parámetros de fetch_all que recibe cada estrategia."""
+    concurrency: int = DEFAULT_CONCURRENCY
+    sink: Union[None, str, Callable] = None
+    retries: int = 0
+    backoff: float = 0.5
+    timeout: Optional[float] = 60.0
+    chunk_size: int = CHUNK_SIZE
+    cache: Optional[ResponseCache] = None
+    options: dict = field(default_factory=dict)
+
+
+# Estrategias registradas: nombre -> función(urls, config, emit)
+STRATEGIES = {}
+
+
+def register_strategy(name: str):
+    """
+    Decorador que registra una estrategia de descarga.
+
+    La función recibe (urls, config, emit): un iterable de URLs, un
+    FetchConfig y una función que debe llamar en el proceso principal con el
+    DownloadResult de cada URL.
+
+    Ejemplo:
+        @register_strategy("secuencial_lenta")
+        def slow(urls, config, emit):
+            ...
+    """
+    def decorator(func):
+        STRATEGIES[name] = func
+        return func
+    return decorator
+
+
+def available_strategies() -> list:
+    """Nombres de las estrategias registradas."""
+    return list(STRATEGIES)
+
+
+def fetch_all(urls: Iterable[str], strategy: str = "asyncio",
+              concurrency: int = DEFAULT_CONCURRENCY, sink: Union[None, str, Callable] = None,
+              retries: int = 0, backoff: float = 0.5, timeout: Optional[float] = 60.0,
+              chunk_size: int = CHUNK_SIZE, cache: Optional[ResponseCache] = None,
+              on_result: Optional[Callable[[DownloadResult], None]] = None, **options) -> list:
+    """
+    Descarga todas las URLs con la estrategia elegida.
+
+    Es bloqueante (las estrategias crean sus propios hilos, procesos o
+    bucles de eventos); desde código asíncrono use descarga_async.download_all.
+
+    Args:
+        urls: Iterable de URLs
+        strategy: Nombre de una estrategia registrada (ver available_strategies)
+        concurrency: Descargas simultáneas (hilos, procesos o tareas según la
+            estrategia; sync lo ignora)
+        sink: None (solo contar bytes), un directorio donde guardar cada cuerpo,
+            o una función sink(url, tramo). En las estrategias con procesos la
+            función corre en cada proceso y debe poder serializarse con pickle.
+        retries: Reintentos por URL ante errores de red, 429 o 5xx
+        backoff: Espera antes del primer reintento (se duplica en cada uno)
+        timeout: Tiempo máximo por solicitud en segundos
+        chunk_size: Tamaño de los tramos de lectura
+        cache: ResponseCache opcional (en los procesos se abre otra sobre el mismo directorio)
+        on_result: Función que recibe cada DownloadResult al terminar
+        **options: Opciones propias de la estrategia (limit_per_host para
+            asyncio y hybrid, processes para hybrid, chunksize para multiprocessing)
+
+    Returns:
+        Lista de DownloadResult en el orden en que terminaron
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estrategia desconocida: {strategy!r}. Disponibles: {available_strategies()}")
+    if concurrency < 1:
+        raise ValueError("concurrency debe ser al menos 1")
+    if isinstance(sink, (str, os.PathLike)):
+        os.makedirs(sink, exist_ok=True)
+
+    config = FetchConfig(concurrency, sink, retries, backoff, timeout, chunk_size, cache, options)
+    results = []
+
+    def emit(result):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    STRATEGIES[strategy](urls, config, emit)
+    return results
+
+
+# =============================================================================
+# DESCARGA CON REQUESTS (sync, threads, multiprocessing)
+# =============================================================================
+
+def _write_chunks(chunks, url: str, sink):
+    """Versión bloqueante de descarga_async._write_chunks. Returns: (bytes, ruta o None)"""
+    size = 0
+    if sink is None or callable(sink):
+        for chunk in chunks:
+            size += len(chunk)
+            if sink is not None:
+                sink(url, chunk)
+        return size, None
+
+    path = os.path.join(sink, file_name(url))
+    descriptor, temporary = tempfile.mkstemp(dir=sink, suffix=".part")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return size, path
+
+
+def _fetch_once(session: requests.Session, url: str, config: FetchConfig) -> DownloadResult:
+    status = None
+    try:
+        if config.cache is not None:
+            entry = config.cache.get(session, url)
+            status = entry.status
+            if config.sink is None:
+                size, path = entry.size, None
+            else:
+                with config.cache.open(entry) as f:
+                    chunks = iter(partial(f.read, config.chunk_size), b"")
+                    size, path = _write_chunks(chunks, url, config.sink)
+            return DownloadResult(url, status, size, 0.0, path)
+        with session.get(url, stream=True, timeout=config.timeout) as response:
+            status = response.status_code
+            response.raise_for_status()
+            size, path = _write_chunks(response.iter_content(config.chunk_size), url, config.sink)
+        return DownloadResult(url, status, size, 0.0, path)
+    except requests.HTTPError as e:
+        status = e.response.status_code if e.response is not None else status
+        return DownloadResult(url, status, 0, 0.0, error=f"{type(e).__name__}: {e}")
+    except (requests.RequestException, OSError) as e:
+        return DownloadResult(url, status, 0, 0.0, error=f"{type(e).__name__}: {e}")
+
+
+def fetch_one(session: requests.Session, url: str, config: FetchConfig, worker: str = "") -> DownloadResult:
+    """
+    Descarga una URL con requests aplicando la caché, el destino y los reintentos de config.
+
+    Args:
+        session: requests.Session
+        url: URL a descargar
+        config: Parámetros de la descarga
+        worker: Nombre de quien descarga (queda en el resultado)
+
+    Returns:
+        Un DownloadResult
+    """
+    start = time.perf_counter()
+    attempt = 0
+    while True:
+        result = _fetch_once(session, url, config)
+        if result.ok or attempt >= config.retries or not is_retryable(result.status):
+            result.seconds = time.perf_counter() - start
+            result.retries = attempt
+            result.worker = worker
+            return result
+        time.sleep(config.backoff * 2 ** attempt)
+        attempt += 1
+
+
+@register_strategy("sync")
+def _sync(urls, config: FetchConfig, emit):
+    with requests.Session() as session:
+        for url in urls:
+            emit(fetch_one(session, url, config, threading.current_thread().name))
+
+
+@register_strategy("threads")
+def _threads(urls, config: FetchConfig, emit):
+    local = threading.local()
+    sessions = []
+
+    def work(url):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            sessions.append(local.session)
+        return fetch_one(local.session, url, config, threading.current_thread().name)
+
+    # A lo sumo 2*concurrency URLs enviadas al pool: el iterable se consume de a poco
+    pending = set()
+    try:
+        with ThreadPoolExecutor(max_workers=config.concurrency, thread_name_prefix="hilo") as executor:
+            for url in urls:
+                if len(pending) >= 2 * config.concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        emit(future.result())
+                pending.add(executor.submit(work, url))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(future.result())
+    finally:
+        for session in sessions:
+            session.close()
+
+
+@register_strategy("asyncio")
+def _asyncio(urls, config: FetchConfig, emit):
+    asyncio.run(_async_download(urls, config, config.concurrency, config.cache, emit))
+
+
+def _async_download(urls, config: FetchConfig, concurrency: int, cache, on_result):
+    return download_all(urls, concurrency=concurrency,
+                        limit_per_host=config.options.get("limit_per_host", 0),
+                        sink=config.sink, chunk_size=config.chunk_size, timeout=config.timeout,
+                        on_result=on_result, cache=cache, retries=config.retries,
+                        backoff=config.backoff)
+
+
+# =============================================================================
+# ESTRATEGIAS CON PROCESOS
+# =============================================================================
+
+# Estado de cada proceso del pool (lo crea _init_process)
+_process = {}
+
+
+def _portable(config: FetchConfig) -> FetchConfig:
+    """Copia de config que puede enviarse a otro proceso (la caché viaja como sus parámetros)."""
+    cache = config.cache
+    spec = None if cache is None else (cache.directory, cache.max_bytes, cache.max_age)
+    return replace(config, cache=spec)
+
+
+def _init_process(config: FetchConfig):
+    spec = config.cache
+    _process["config"] = replace(config, cache=None if spec is None else ResponseCache(*spec))
+    _process["session"] = requests.Session()
+
+
+def _stats_since(before: Optional[dict]) -> Optional[dict]:
+    """Contadores de la caché de este proceso desde la foto before (None sin caché)."""
+    cache = _process["config"].cache
+    if cache is None:
+        return None
+    return {name: value - before[name] for name, value in asdict(cache.stats).items()}
+
+
+def _add_stats(cache: Optional[ResponseCache], delta: Optional[dict]):
+    """Suma a la caché del proceso principal los contadores que envió un proceso del pool."""
+    if cache is None or delta is None:
+        return
+    for name, value in delta.items():
+        setattr(cache.stats, name, getattr(cache.stats, name) + value)
+
+
+def _fetch_in_process(url: str) -> DownloadResult:
+    return fetch_one(_process["session"], url, _process["config"],
+                     multiprocessing.current_process().name)
+
+
+def _fetch_group_in_process(urls: list) -> tuple:
+    """Descarga las copias de una URL una tras otra: la primera va a la red y las demás a la caché."""
+    before = asdict(_process["config"].cache.stats)
+    return [_fetch_in_process(url) for url in urls], _stats_since(before)
+
+
+def _loop_in_process(batch: tuple) -> tuple:
+    concurrency, urls = batch
+    config = _process["config"]
+    name = multiprocessing.current_process().name
+    before = None if config.cache is None else asdict(config.cache.stats)
+    results = []
+
+    def collect(result):
+        result.worker = f"{name}/{result.worker}"
+        results.append(result)
+
+    asyncio.run(_async_download(urls, config, concurrency, config.cache, collect))
+    return results, _stats_since(before)
+
+
+@register_strategy("multiprocessing")
+def _multiprocessing(urls, config: FetchConfig, emit):
+    with multiprocessing.Pool(processes=config.concurrency, initializer=_init_process,
+                              initargs=(_portable(config),)) as pool:
+        if config.cache is None:
+            for result in pool.imap_unordered(_fetch_in_process, urls,
+                                              chunksize=config.options.get("chunksize", 1)):
+                emit(result)
+            return
+        # Las cachés de los procesos no agrupan solicitudes entre sí: las copias de una URL
+        # se envían juntas a un mismo proceso para que la red se use una vez por recurso
+        groups = {}
+        for url in urls:
+            groups.setdefault(url, []).append(url)
+        for results, stats in pool.imap_unordered(_fetch_group_in_process, groups.values()):
+            _add_stats(config.cache, stats)
+            for result in results:
+                emit(result)
+
+
+def _balanced_batches(urls: list, parts: int, group: bool) -> list:
+    """
+    Reparte urls en a lo sumo parts lotes no vacíos con cantidades de URLs similares.
+
+    Con group=True las copias de una URL van juntas al mismo lote, para que
+    la caché de ese proceso la descargue una sola vez; los grupos se asignan
+    del más grande al más chico al lote con menos URLs. Sin caché cada copia
+    es una descarga aparte y las URLs se reparten por turnos.
+    """
+    if not group:
+        return [urls[i::parts] for i in range(min(parts, len(urls)))]
+    groups = {}
+    for url in urls:
+        groups.setdefault(url, []).append(url)
+    batches = [[] for _ in range(min(parts, len(groups)))]
+    for copies in sorted(groups.values(), key=len, reverse=True):
+        min(batches, key=len).extend(copies)
+    return batches
+
+
+@register_strategy("hybrid")
+def _hybrid(urls, config: FetchConfig, emit):
+    # Cada proceso recibe un lote de URLs y lo descarga con su propio bucle
+    urls = list(urls)
+    if not urls:
+        return
+    processes = config.options.get("processes") or os.cpu_count() or 1
+    batches = _balanced_batches(urls, max(1, min(processes, config.concurrency)), config.cache is not None)
+    # concurrency es el total de descargas en curso: los límites de los procesos suman exactamente eso
+    base, extra = divmod(config.concurrency, len(batches))
+    limits = [base + (i < extra) for i in range(len(batches))]
+    with multiprocessing.Pool(processes=len(batches), initializer=_init_process,
+                              initargs=(_portable(config),)) as pool:
+        for results, stats in pool.imap_unordered(_loop_in_process, zip(limits, batches)):
+            _add_stats(config.cache, stats)
+            for result in results:
+                emit(result)
+
+
+# =============================================================================
+# LÍNEA DE COMANDOS
+# =============================================================================
+
+def build_parser(description: str) -> argparse.ArgumentParser:
+    """Parser con las opciones comunes de los scripts de descarga."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Descargas simultáneas (hilos, procesos o tareas)")
+    parser.add_argument("--retries", type=int, default=0, help="Reintentos por URL")
+    parser.add_argument("--sink", default=None, help="Directorio donde guardar los cuerpos")
+    parser.add_argument("--urls", default=None,
+                        help="Archivo con una URL por línea (por defecto las imágenes del taller)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Descargar todo de la red sin usar la caché en disco")
+    parser.add_argument("--quiet", action="store_true", help="No mostrar cada descarga")
+    return parser
+
+
+def load_urls(path: Optional[str] = None) -> list:
+    """URLs de un archivo (una por línea) o IMAGE_URLS si no se da ninguno."""
+    if path is None:
+        return list(IMAGE_URLS)
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def print_result(result: DownloadResult):
+    """Muestra una descarga terminada."""
+    if result.ok:
+        print(f"{result.worker}: Read {result.size} bytes from {result.url}")
+    else:
+        print(f"{result.worker}: Error {result.error} from {result.url}")
+
+
+def run_strategy(strategy: str, urls: list, args: argparse.Namespace) -> tuple:
+    """
+    Ejecuta una estrategia con las opciones de la línea de comandos.
+
+    Cada estrategia usa su propio directorio de caché, así todas descargan
+    cada recurso único una vez en la primera ejecución.
+
+    Returns:
+        (segundos, lista de DownloadResult, ResponseCache o None)
+    """
+    cache = None if args.no_cache else ResponseCache(os.path.join(DEFAULT_DIRECTORY, strategy))
+    start = time.perf_counter()
+    results = fetch_all(urls, strategy=strategy, concurrency=args.concurrency, sink=args.sink,
+                        retries=args.retries, cache=cache,
+                        on_result=None if args.quiet else print_result)
+    return time.perf_counter() - start, results, cache
+
+
+def main(strategy: Optional[str] = None, argv: Optional[list] = None):
+    """
+    Línea de comandos de una estrategia (la de los scripts Solo_*.py).
+
+    Args:
+        strategy: Estrategia fija; si es None se elige con --strategy
+        argv: Argumentos (por defecto sys.argv)
+    """
+    parser = build_parser(f"Descarga con la estrategia {strategy}" if strategy
+                          else "Descarga con una de las estrategias del motor")
+    if strategy is None:
+        parser.add_argument("--strategy", choices=available_strategies(), default="asyncio")
+    args = parser.parse_args(argv)
+    strategy = strategy or args.strategy
+    urls = load_urls(args.urls)
+    seconds, results, cache = run_strategy(strategy, urls, args)
+    failed = sum(not r.ok for r in results)
+    print(f"Descarga con {strategy}: {len(urls)} en {seconds:.2f} segundos ({failed} fallidas)")
+    if cache is not None:
+        print(f"Caché: {cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
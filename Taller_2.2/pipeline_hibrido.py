@@ -0,0 +1,424 @@
+"""
+Pipeline híbrido: descargas con asyncio, procesamiento con procesos
+===================================================================
+
+Las imágenes se descargan con asyncio (la E/S no necesita procesos) y se
+decodifican y redimensionan en un ProcessPoolExecutor (el trabajo de CPU sí):
+
+    descargas asyncio  -->  cola acotada  -->  procesos (PIL)
+    (concurrency)           (queue_size)       (processes)
+
+Los cuerpos no se envían a los procesos con pickle: cada descarga se escribe
+directamente en un bloque de memoria compartida (multiprocessing.shared_memory)
+y al proceso solo le llega el nombre del bloque y el largo. Los bloques son
+un conjunto fijo que se reutiliza, así que la memoria usada no depende del
+número de URLs; un cuerpo que no cabe en un bloque usa uno propio temporal.
+
+Si la cola está llena las descargas esperan; el reporte (PipelineReport)
+muestra el rendimiento de cada etapa para dimensionar cada una.
+
+Ejemplo:
+    reporte = process_images(urls, concurrency=10, processes=4, output="miniaturas")
+    print(reporte)
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Iterable, Optional
+
+import aiohttp
+from PIL import Image
+
+from descarga_async import CHUNK_SIZE, DEFAULT_CONCURRENCY, fetch, file_name, is_retryable
+
+# Tamaño de cada bloque de memoria compartida (los cuerpos mayores usan un bloque propio)
+DEFAULT_SLOT_SIZE = 1024 * 1024
+
+# Cuerpos descargados que pueden esperar a un proceso libre
+DEFAULT_QUEUE_SIZE = 8
+
+# Tamaño máximo de las imágenes procesadas por defecto
+DEFAULT_THUMBNAIL = (256, 256)
+
+
+@dataclass
+class StageStats:
+    """Rendimiento de una etapa del pipeline."""
+    name: str
+    workers: int
+    items: int = 0
+    failed: int = 0
+    bytes: int = 0
+    busy: float = 0.0
+    start: Optional[float] = None
+    end: Optional[float] = None
+
+    def _record(self, start: float, end: float, busy: Optional[float] = None):
+        self.start = start if self.start is None else min(self.start, start)
+        self.end = end if self.end is None else max(self.end, end)
+        self.busy += end - start if busy is None else busy
+
+    @property
+    def wall(self) -> float:
+        """Segundos entre el primer elemento que entró y el último que salió."""
+        return 0.0 if self.start is None else self.end - self.start
+
+    @property
+    def throughput(self) -> float:
+        """Elementos por segundo logrados."""
+        return self.items / self.wall if self.wall else 0.0
+
+    @property
+    def capacity(self) -> float:
+        """Elementos por segundo que la etapa lograría si nunca esperara a la otra."""
+        return self.items * self.workers / self.busy if self.busy else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fracción del tiempo en que los workers estuvieron ocupados."""
+        return self.busy / (self.wall * self.workers) if self.wall else 0.0
+
+
+@dataclass
+class ImageResult:
+    """Resultado de descargar y procesar una imagen."""
+    url: str
+    size: int
+    width: int = 0
+    height: int = 0
+    output_width: int = 0
+    output_height: int = 0
+    output_size: int = 0
+    path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Indica si la imagen se descargó y procesó sin error."""
+        return self.error is None
+
+
+@dataclass
+class PipelineReport:
+    """Rendimiento de cada etapa y de la cola entre ellas."""
+    fetch: StageStats
+    transform: StageStats
+    queue_size: int
+    queue_max: int = 0
+    queue_wait: float = 0.0
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        lines = [f"{'etapa':<12} {'workers':>7} {'items':>6} {'fallidas':>8} {'MB':>8} "
+                 f"{'pared (s)':>9} {'items/s':>8} {'capacidad/s':>11} {'uso':>5}"]
+        for stage in (self.fetch, self.transform):
+            lines.append(f"{stage.name:<12} {stage.workers:>7} {stage.items:>6} {stage.failed:>8} "
+                         f"{stage.bytes / 1e6:>8.2f} {stage.wall:>9.2f} {stage.throughput:>8.1f} "
+                         f"{stage.capacity:>11.1f} {stage.utilization:>5.0%}")
+        waited = self.transform.items + self.transform.failed
+        mean_wait = self.queue_wait / waited if waited else 0.0
+        lines.append(f"cola: tamaño {self.queue_size}, máximo {self.queue_max}, "
+                     f"espera media {mean_wait:.4f} s")
+        lines.append(f"total: {self.transform.items} imágenes en {self.seconds:.2f} s")
+        return "\n".join(lines)
+
+
+# =============================================================================
+# PROCESOS
+# =============================================================================
+
+# Bloques de memoria compartida abiertos en cada proceso (se abren una vez)
+_attached = {}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    block = _attached.get(name)
+    if block is None:
+        block = _attached[name] = shared_memory.SharedMemory(name=name)
+    return block
+
+
+def _process_image(name: str, length: int, dedicated: bool, url: str,
+                   transform: Optional[Callable], size: tuple, image_format: str,
+                   output: Optional[str]) -> tuple:
+    """
+    Decodifica, transforma y codifica una imagen guardada en memoria compartida.
+
+    Returns:
+        (ImageResult, segundos ocupados)
+    """
+    start = time.perf_counter()
+    block = shared_memory.SharedMemory(name=name) if dedicated else _attach(name)
+    try:
+        with block.buf[:length] as view:
+            data = io.BytesIO(view)
+        with Image.open(data) as picture:
+            width, height = picture.size
+            if transform is None:
+                # thumbnail usa draft(): los JPEG se decodifican ya reducidos
+                picture.thumbnail(size)
+                result_image = picture
+            else:
+                result_image = transform(picture)
+            if image_format.upper() == "JPEG" and result_image.mode not in ("RGB", "L"):
+                result_image = result_image.convert("RGB")
+            encoded = io.BytesIO()
+            result_image.save(encoded, format=image_format)
+        path = None
+        if output is not None:
+            extension = "." + image_format.lower().replace("jpeg", "jpg")
+            path = os.path.join(output, os.path.splitext(file_name(url))[0] + extension)
+            with open(path, "wb") as f:
+                f.write(encoded.getbuffer())
+        result = ImageResult(url, length, width, height, result_image.width, result_image.height,
+                             encoded.tell(), path)
+    except Exception as e:
+        # Cualquier fallo del decodificador o de la transformación queda en el resultado
+        result = ImageResult(url, length, error=f"{type(e).__name__}: {e}")
+    finally:
+        if dedicated:
+            block.close()
+    return result, time.perf_counter() - start
+
+
+# =============================================================================
+# MEMORIA COMPARTIDA
+# =============================================================================
+
+class _Body:
+    """Cuerpo de una descarga escrito en un bloque de memoria compartida."""
+
+    def __init__(self, block: shared_memory.SharedMemory, capacity: int):
+        self.block = block
+        self.capacity = capacity
+        self.length = 0
+        self.overflow = None
+
+    def reset(self):
+        self.length = 0
+        self.overflow = None
+
+    def write(self, url: str, chunk: bytes):
+        end = self.length + len(chunk)
+        if self.overflow is None and end <= self.capacity:
+            self.block.buf[self.length:end] = chunk
+        else:
+            # No cabe en el bloque: se acumula aparte y se copia a un bloque propio
+            if self.overflow is None:
+                self.overflow = bytearray(self.block.buf[:self.length])
+            self.overflow += chunk
+        self.length = end
+
+    def dedicated(self) -> Optional[shared_memory.SharedMemory]:
+        """Bloque propio con el cuerpo si no cupo en el compartido, o None."""
+        if self.overflow is None:
+            return None
+        block = shared_memory.SharedMemory(create=True, size=max(1, self.length))
+        block.buf[:self.length] = self.overflow
+        self.overflow = None
+        return block
+
+
+def _release(block: shared_memory.SharedMemory):
+    block.close()
+    block.unlink()
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+async def run_pipeline(urls: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY,
+                       processes: Optional[int] = None, queue_size: int = DEFAULT_QUEUE_SIZE,
+                       transform: Optional[Callable] = None, size: tuple = DEFAULT_THUMBNAIL,
+                       image_format: str = "JPEG", output: Optional[str] = None,
+                       slot_size: int = DEFAULT_SLOT_SIZE, retries: int = 0, backoff: float = 0.5,
+                       timeout: Optional[float] = 60.0, limit_per_host: int = 0,
+                       on_result: Optional[Callable[[ImageResult], None]] = None) -> PipelineReport:
+    """
+    Descarga las imágenes con asyncio y las procesa en un pool de procesos.
+
+    Args:
+        urls: Iterable de URLs (se consume a medida que hay bloques libres)
+        concurrency: Descargas simultáneas
+        processes: Procesos del pool (por defecto os.cpu_count())
+        queue_size: Cuerpos descargados que pueden esperar a un proceso libre
+        transform: Función transform(imagen PIL) -> imagen PIL que corre en los
+            procesos (debe poder serializarse con pickle); por defecto reduce
+            la imagen a `size` conservando la proporción
+        size: Tamaño máximo (ancho, alto) de la transformación por defecto
+        image_format: Formato de salida de PIL ("JPEG", "PNG", "WEBP", ...)
+        output: Directorio donde guardar las imágenes procesadas (None no las guarda)
+        slot_size: Bytes de cada bloque de memoria compartida
+        retries: Reintentos por descarga ante errores de red, 429 o 5xx
+        backoff: Espera antes del primer reintento (se duplica en cada uno)
+        timeout: Tiempo máximo por descarga en segundos
+        limit_per_host: Máximo de conexiones a un mismo host (0 sin límite)
+        on_result: Función que recibe cada ImageResult al terminar
+
+    Returns:
+        Un PipelineReport
+    """
+    processes = processes or os.cpu_count() or 1
+    if concurrency < 1 or processes < 1 or queue_size < 1:
+        raise ValueError("concurrency, processes y queue_size deben ser al menos 1")
+    if output is not None:
+        os.makedirs(output, exist_ok=True)
+
+    loop = asyncio.get_running_loop()
+    report = PipelineReport(StageStats("descarga", concurrency),
+                            StageStats("procesado", processes), queue_size)
+    urls_queue = asyncio.Queue(maxsize=concurrency)
+    ready = asyncio.Queue(maxsize=queue_size)
+
+    # Un bloque por descarga en curso, por lugar en la cola y por proceso:
+    # nunca hace falta esperar un bloque que no vaya a liberarse
+    blocks = []
+    free = asyncio.Queue()
+
+    def emit(result):
+        if on_result is not None:
+            on_result(result)
+
+    async def produce():
+        for url in urls:
+            await urls_queue.put(url)
+        for _ in range(concurrency):
+            await urls_queue.put(None)
+
+    async def fetcher(session):
+        while True:
+            url = await urls_queue.get()
+            if url is None:
+                return
+            block = await free.get()
+            body = _Body(block, slot_size)
+            start = time.perf_counter()
+            attempt = 0
+            while True:
+                body.reset()
+                result = await fetch(session, url, sink=body.write, chunk_size=CHUNK_SIZE)
+                if result.ok or attempt >= retries or not is_retryable(result.status):
+                    break
+                await asyncio.sleep(backoff * 2 ** attempt)
+                attempt += 1
+            report.fetch._record(start, time.perf_counter())
+            if not result.ok:
+                free.put_nowait(block)
+                report.fetch.failed += 1
+                emit(ImageResult(url, 0, error=result.error))
+                continue
+            report.fetch.items += 1
+            report.fetch.bytes += body.length
+            dedicated = body.dedicated()
+            if dedicated is not None:
+                free.put_nowait(block)
+            await ready.put((url, dedicated or block, body.length, dedicated is not None,
+                             time.perf_counter()))
+            report.queue_max = max(report.queue_max, ready.qsize())
+
+    async def dispatcher():
+        while True:
+            item = await ready.get()
+            if item is None:
+                return
+            url, block, length, dedicated, queued = item
+            report.queue_wait += time.perf_counter() - queued
+            start = time.perf_counter()
+            try:
+                result, busy = await loop.run_in_executor(
+                    pool, _process_image, block.name, length, dedicated, url,
+                    transform, size, image_format, output)
+            finally:
+                if dedicated:
+                    _release(block)
+                else:
+                    free.put_nowait(block)
+            # El tiempo ocupado es el medido dentro del proceso, sin la espera del pool
+            report.transform._record(start, time.perf_counter(), busy)
+            report.transform.bytes += length
+            if result.ok:
+                report.transform.items += 1
+            else:
+                report.transform.failed += 1
+            emit(result)
+
+    start = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=processes)
+    tasks = []
+    try:
+        for _ in range(concurrency + queue_size + processes):
+            block = shared_memory.SharedMemory(create=True, size=slot_size)
+            blocks.append(block)
+            free.put_nowait(block)
+        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=limit_per_host)
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+            fetchers = [asyncio.create_task(produce())]
+            fetchers += [asyncio.create_task(fetcher(session)) for _ in range(concurrency)]
+            dispatchers = [asyncio.create_task(dispatcher()) for _ in range(processes)]
+            tasks = fetchers + dispatchers
+
+            async def finish_fetching():
+                # Cuando terminan las descargas se avisa a los dispatchers
+                await asyncio.gather(*fetchers)
+                for _ in dispatchers:
+                    await ready.put(None)
+
+            # Un error en cualquier etapa se propaga sin dejar a la otra esperando
+            await asyncio.gather(finish_fetching(), *dispatchers)
+    finally:
+        for task in tasks:
+            task.cancel()
+        pool.shutdown(wait=True, cancel_futures=True)
+        for block in blocks:
+            _release(block)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def process_images(urls: Iterable[str], **kwargs) -> PipelineReport:
+    """Versión bloqueante de run_pipeline (mismos argumentos)."""
+    return asyncio.run(run_pipeline(urls, **kwargs))
+
+
+def main():
+    from motor_descargas import load_urls
+
+    parser = argparse.ArgumentParser(description="Descarga imágenes con asyncio y las procesa con procesos")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Descargas simultáneas")
+    parser.add_argument("--processes", type=int, default=None, help="Procesos para el procesado")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Imágenes descargadas que pueden esperar un proceso")
+    parser.add_argument("--size", type=int, nargs=2, default=list(DEFAULT_THUMBNAIL),
+                        metavar=("ANCHO", "ALTO"), help="Tamaño máximo de las miniaturas")
+    parser.add_argument("--format", default="JPEG", help="Formato de salida")
+    parser.add_argument("--output", default=None, help="Directorio donde guardar las miniaturas")
+    parser.add_argument("--retries", type=int, default=0, help="Reintentos por descarga")
+    parser.add_argument("--urls", default=None,
+                        help="Archivo con una URL por línea (por defecto las imágenes del taller)")
+    parser.add_argument("--quiet", action="store_true", help="No mostrar cada imagen")
+    args = parser.parse_args()
+
+    def show(result):
+        if result.ok:
+            print(f"{result.width}x{result.height} -> {result.output_width}x{result.output_height} "
+                  f"({result.output_size} bytes) from {result.url}")
+        else:
+            print(f"Error {result.error} from {result.url}")
+
+    report = process_images(load_urls(args.urls), concurrency=args.concurrency,
+                            processes=args.processes, queue_size=args.queue_size,
+                            size=tuple(args.size), image_format=args.format, output=args.output,
+                            retries=args.retries, on_result=None if args.quiet else show)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
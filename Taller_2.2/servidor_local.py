@@ -0,0 +1,324 @@
+"""
+Servidor HTTP local para pruebas
+================================
+
+Servidor aiohttp.web que reemplaza a Unsplash/httpbin en las pruebas: sirve
+cuerpos de tamaño conocido en tramos y cuenta las conexiones simultáneas,
+para comprobar los límites de concurrencia sin depender de la red.
+
+Rutas:
+    /bytes/{tamaño}   Cuerpo de tamaño bytes. Parámetros opcionales:
+                        delay=segundos antes de responder
+                        jitter=segundos: se suma al delay un valor uniforme en [-jitter, jitter]
+                        error_rate=fracción de solicitudes que responden 503
+                        max_age=segundos para Cache-Control
+                      Lleva ETag y responde 304 a If-None-Match con ese ETag.
+    /status/{código}  Respuesta vacía con ese código de estado
+    /flaky/{fallos}/{tamaño}
+                      Responde 503 las primeras `fallos` veces que se pide esa
+                      URL y luego como /bytes/{tamaño} (para probar reintentos)
+    /image/{ancho}x{alto}.{png|jpg}
+                      Imagen generada con PIL (para probar el procesamiento)
+
+Uso:
+    python servidor_local.py --port 8080
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import threading
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+# Tamaño de los tramos en que se escriben los cuerpos
+CHUNK_SIZE = 64 * 1024
+
+# Patrón de bytes de los cuerpos: permite verificar el contenido descargado
+_PATTERN = bytes(range(256)) * (CHUNK_SIZE // 256)
+
+
+def payload(size: int) -> bytes:
+    """Cuerpo que sirve /bytes/{size} (útil para verificar una descarga)."""
+    return (_PATTERN * (size // len(_PATTERN) + 1))[:size]
+
+
+@dataclass
+class ServerState:
+    """Contadores y estado mutable de una aplicación creada con make_app."""
+    # Generador del jitter y de los errores simulados
+    rng: random.Random = field(default_factory=random.Random)
+    requests: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    not_modified: int = 0
+    # Veces que se pidió cada URL de /flaky
+    flaky: dict = field(default_factory=dict)
+    # Imágenes ya generadas por (ancho, alto, extensión)
+    images: dict = field(default_factory=dict)
+
+
+# La aplicación se congela al iniciar: el estado se guarda una vez y se modifican sus atributos
+STATE = web.AppKey("state", ServerState)
+
+
+@web.middleware
+async def _count_requests(request, handler):
+    """Lleva la cuenta de las solicitudes atendidas y del máximo simultáneo."""
+    state = request.app[STATE]
+    state.requests += 1
+    state.in_flight += 1
+    state.max_in_flight = max(state.max_in_flight, state.in_flight)
+    try:
+        return await handler(request)
+    finally:
+        state.in_flight -= 1
+
+
+async def _bytes(request):
+    """Sirve un cuerpo de {size} bytes en tramos, opcionalmente tras ?delay= segundos."""
+    size = int(request.match_info["size"])
+    query = request.query
+    state = request.app[STATE]
+    delay = float(query.get("delay", 0))
+    if "jitter" in query:
+        jitter = float(query["jitter"])
+        delay = max(0.0, delay + state.rng.uniform(-jitter, jitter))
+    if delay:
+        await asyncio.sleep(delay)
+    if "error_rate" in query and state.rng.random() < float(query["error_rate"]):
+        return web.Response(status=503)
+    headers = {"Content-Type": "application/octet-stream", "ETag": f'"{size}"'}
+    if "max_age" in request.query:
+        headers["Cache-Control"] = f"max-age={int(request.query['max_age'])}"
+    if request.headers.get("If-None-Match") == headers["ETag"]:
+        state.not_modified += 1
+        return web.Response(status=304, headers=headers)
+    response = web.StreamResponse(headers=headers)
+    response.content_length = size
+    await response.prepare(request)
+    for start in range(0, size, CHUNK_SIZE):
+        await response.write(_PATTERN[:min(CHUNK_SIZE, size - start)])
+    await response.write_eof()
+    return response
+
+
+async def _flaky(request):
+    """Falla con 503 las primeras veces que se pide una URL y luego sirve el cuerpo."""
+    seen = request.app[STATE].flaky
+    seen[request.path_qs] = seen.get(request.path_qs, 0) + 1
+    if seen[request.path_qs] <= int(request.match_info["failures"]):
+        return web.Response(status=503)
+    return await _bytes(request)
+
+
+def image(width: int, height: int, extension: str = "png") -> bytes:
+    """Imagen (degradado) que sirve /image/{width}x{height}.{extension}."""
+    import io
+    from PIL import Image
+
+    picture = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    buffer = io.BytesIO()
+    picture.save(buffer, format="JPEG" if extension == "jpg" else "PNG")
+    return buffer.getvalue()
+
+
+async def _image(request):
+    """Sirve una imagen generada (se genera una vez por tamaño y formato)."""
+    key = (int(request.match_info["width"]), int(request.match_info["height"]),
+           request.match_info["extension"])
+    images = request.app[STATE].images
+    if key not in images:
+        images[key] = image(*key)
+    content_type = "image/jpeg" if key[2] == "jpg" else "image/png"
+    return web.Response(body=images[key], content_type=content_type)
+
+
+async def _status(request):
+    """Responde con el código de estado pedido."""
+    return web.Response(status=int(request.match_info["code"]))
+
+
+def make_app(seed: int = None) -> web.Application:
+    """
+    Crea la aplicación con sus rutas y contadores.
+
+    Args:
+        seed: Semilla del generador de jitter y errores (None no reproducible)
+    """
+    app = web.Application(middlewares=[_count_requests])
+    app[STATE] = ServerState(random.Random(seed))
+    app.router.add_get("/bytes/{size:\\d+}", _bytes)
+    app.router.add_get("/status/{code:\\d+}", _status)
+    app.router.add_get("/flaky/{failures:\\d+}/{size:\\d+}", _flaky)
+    app.router.add_get("/image/{width:\\d+}x{height:\\d+}.{extension:png|jpg}", _image)
+    return app
+
+
+class LocalServer:
+    """
+    Servidor local como context manager asíncrono.
+
+    Ejemplo:
+        async with LocalServer() as server:
+            await download_all([server.url("/bytes/1000")] * 10)
+            print(server.max_in_flight)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, app: web.Application = None):
+        """
+        Args:
+            host: Dirección en la que escuchar
+            port: Puerto (0 elige uno libre)
+            app: Aplicación a servir (por defecto make_app())
+        """
+        self.host = host
+        self.port = port
+        self.app = app if app is not None else make_app()
+        self._runner = None
+
+    async def __aenter__(self) -> "LocalServer":
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._runner.cleanup()
+
+    def url(self, path: str) -> str:
+        """URL absoluta de una ruta del servidor."""
+        return f"http://{self.host}:{self.port}{path}"
+
+    @property
+    def requests(self) -> int:
+        """Número de solicitudes atendidas."""
+        return self.app[STATE].requests
+
+    @property
+    def not_modified(self) -> int:
+        """Número de respuestas 304 enviadas."""
+        return self.app[STATE].not_modified
+
+    @property
+    def max_in_flight(self) -> int:
+        """Máximo de solicitudes atendidas al mismo tiempo."""
+        return self.app[STATE].max_in_flight
+
+
+class ThreadedServer(LocalServer):
+    """
+    LocalServer que corre en un hilo con su propio bucle de eventos.
+
+    Sirve para clientes bloqueantes (requests, hilos, procesos), que no
+    pueden compartir el bucle del servidor.
+
+    Ejemplo:
+        with ThreadedServer() as server:
+            requests.get(server.url("/bytes/1000"))
+    """
+
+    def __enter__(self) -> "ThreadedServer":
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+        failure = []
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self.__aenter__())
+            except BaseException as e:
+                failure.append(e)
+                return
+            finally:
+                started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="servidor_local", daemon=True)
+        self._thread.start()
+        started.wait()
+        if failure:
+            self._thread.join()
+            self._loop.close()
+            raise failure[0]
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self.__aexit__(*exc_info), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+async def _serve_forever(connection, host: str, port: int, seed):
+    async with LocalServer(host, port, make_app(seed)) as server:
+        connection.send(server.port)
+        await asyncio.Event().wait()
+
+
+def _serve_in_process(connection, host: str, port: int, seed):
+    asyncio.run(_serve_forever(connection, host, port, seed))
+
+
+class ServerProcess:
+    """
+    Servidor local en un proceso aparte.
+
+    Para mediciones: el tiempo de CPU del servidor no se suma al del cliente
+    y el servidor no compite por el GIL con él. Los contadores de solicitudes
+    quedan en el otro proceso.
+
+    Ejemplo:
+        with ServerProcess(seed=0) as server:
+            fetch_all([server.url("/bytes/1000?delay=0.01")] * 100, strategy="threads")
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, seed: int = None):
+        """
+        Args:
+            host: Dirección en la que escuchar
+            port: Puerto (0 elige uno libre)
+            seed: Semilla del jitter y de los errores simulados
+        """
+        self.host = host
+        self.port = port
+        self.seed = seed
+        self._process = None
+
+    def __enter__(self) -> "ServerProcess":
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        self._process = multiprocessing.Process(target=_serve_in_process, name="servidor_local",
+                                                args=(sender, self.host, self.port, self.seed),
+                                                daemon=True)
+        self._process.start()
+        sender.close()
+        try:
+            self.port = receiver.recv()
+        except EOFError:
+            self._process.join()
+            raise RuntimeError("El servidor local no pudo iniciar") from None
+        finally:
+            receiver.close()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._process.terminate()
+        self._process.join()
+
+    url = LocalServer.url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor HTTP local para probar las descargas")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+    web.run_app(make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+Pruebas de las descargas contra el servidor local (no necesitan red).
+
+Uso:
+    python test_descarga.py
+"""
+
+import asyncio
+import warnings
+
+
+def test_concurrencia_acotada():
+    """download_all nunca supera el límite de descargas ni de conexiones por host."""
+    print("Probando concurrencia acotada...")
+
+    try:
+        from descarga_async import download_all
+        from servidor_local import LocalServer
+
+        async def probar():
+            async with LocalServer() as server:
+                urls = [server.url(f"/bytes/{1000 + i}?delay=0.01") for i in range(100)]
+                resumen = await download_all(urls, concurrency=10)
+                if (resumen.completed == 100 and resumen.failed == 0
+                        and resumen.bytes == sum(1000 + i for i in range(100))):
+                    print("✓ 100 descargas completas con el número de bytes correcto")
+                else:
+                    print(f"✗ Resumen incorrecto: {resumen}")
+                if resumen.max_in_flight <= 10 and server.max_in_flight <= 10:
+                    print(f"✓ A lo sumo 10 descargas simultáneas ({server.max_in_flight} en el servidor)")
+                else:
+                    print(f"✗ Se superó el límite: {resumen.max_in_flight}, {server.max_in_flight}")
+
+            async with LocalServer() as server:
+                urls = [server.url("/bytes/100?delay=0.02")] * 30
+                await download_all(urls, concurrency=10, limit_per_host=3)
+                if server.max_in_flight <= 3:
+                    print("✓ limit_per_host limita las conexiones al servidor")
+                else:
+                    print(f"✗ {server.max_in_flight} conexiones con limit_per_host=3")
+
+        with warnings.catch_warnings(record=True) as avisos:
+            warnings.simplefilter("always")
+            asyncio.run(probar())
+        if not avisos:
+            print("✓ El servidor actualiza sus contadores sin advertencias de aiohttp")
+        else:
+            print(f"✗ Advertencias del servidor: {[str(a.message) for a in avisos]}")
+
+    except Exception as e:
+        print(f"✗ Error en concurrencia acotada: {e}")
+
+def test_destinos():
+    """Los cuerpos se escriben en disco o se entregan en tramos a una función."""
+    print("\nProbando destinos de los cuerpos...")
+
+    try:
+        import os
+        import pathlib
+        import tempfile
+        from descarga_async import download_all, file_name
+        from servidor_local import LocalServer, payload
+
+        async def probar():
+            async with LocalServer() as server:
+                carpeta = tempfile.mkdtemp()
+                urls = [server.url(f"/bytes/{n}") for n in (10, 70000, 300000)]
+                await download_all(urls, sink=carpeta)
+                correctos = all(
+                    pathlib.Path(carpeta, file_name(url)).read_bytes() == payload(n)
+                    for url, n in zip(urls, (10, 70000, 300000)))
+                if correctos and not any(f.endswith(".part") for f in os.listdir(carpeta)):
+                    print("✓ Archivos escritos en disco con el contenido correcto")
+                else:
+                    print("✗ Contenido en disco incorrecto")
+
+                tramos = []
+                await download_all([server.url("/bytes/200000")], chunk_size=32768,
+                                   sink=lambda url, tramo: tramos.append(len(tramo)))
+                if sum(tramos) == 200000 and max(tramos) <= 32768:
+                    print(f"✓ El cuerpo llega en {len(tramos)} tramos a la función")
+                else:
+                    print(f"✗ Tramos incorrectos: {tramos}")
+
+        asyncio.run(probar())
+
+    except Exception as e:
+        print(f"✗ Error en destinos: {e}")
+
+def test_errores_y_generadores():
+    """Los errores quedan en el resultado y las URLs se consumen a medida que avanzan las descargas."""
+    print("\nProbando errores y entrada perezosa...")
+
+    try:
+        from descarga_async import download_all
+        from servidor_local import LocalServer
+
+        async def probar():
+            async with LocalServer() as server:
+                resultados = []
+                urls = [server.url("/bytes/10"), server.url("/status/500"), server.url("/status/404")]
+                resumen = await download_all(urls, on_result=resultados.append)
+                estados = sorted(r.status for r in resultados if not r.ok)
+                if resumen.completed == 1 and resumen.failed == 2 and estados == [404, 500]:
+                    print("✓ Las respuestas de error se cuentan como fallidas sin interrumpir")
+                else:
+                    print(f"✗ Errores mal contados: {resumen}")
+
+                # Con concurrency=2 la cola admite 2 URLs: el generador no se adelanta
+                # más de concurrency URLs en cola más concurrency en curso
+                adelanto = []
+                terminadas = 0
+
+                def generador():
+                    for _ in range(50):
+                        adelanto.append(len(adelanto) - terminadas)
+                        yield server.url("/bytes/10")
+
+                def contar(resultado):
+                    nonlocal terminadas
+                    terminadas += 1
+
+                resumen = await download_all(generador(), concurrency=2, on_result=contar)
+                if resumen.completed == 50 and max(adelanto) <= 2 * 2 + 1:
+                    print(f"✓ Generador consumido de a poco (adelanto máximo {max(adelanto)})")
+                else:
+                    print(f"✗ El generador se consumió de antemano (adelanto {max(adelanto)})")
+
+        asyncio.run(probar())
+
+    except Exception as e:
+        print(f"✗ Error en errores y generadores: {e}")
+
+def test_cache():
+    """Las URLs repetidas se descargan una vez y las siguientes ejecuciones usan el disco."""
+    print("\nProbando caché de descargas...")
+
+    try:
+        import tempfile
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        import requests
+        from cache_descargas import ResponseCache, body_size
+        from descarga_async import download_all
+        from servidor_local import LocalServer, payload
+
+        async def probar():
+            async with LocalServer() as server:
+                carpeta = tempfile.mkdtemp()
+                urls = [server.url(f"/bytes/{1000 * (i % 7 + 1)}?delay=0.02") for i in range(70)]
+                cache = ResponseCache(carpeta)
+                resumen = await download_all(urls, concurrency=10, cache=cache)
+                if (server.requests == 7 and cache.stats.misses == 7 and resumen.completed == 70
+                        and resumen.bytes == 10 * sum(1000 * k for k in range(1, 8))):
+                    print(f"✓ 70 solicitudes, 7 descargas ({cache.stats.coalesced} agrupadas en curso)")
+                else:
+                    print(f"✗ Descargas repetidas: {server.requests}, {cache.stats}")
+
+                # Otra ejecución (otra instancia) sobre el mismo directorio no usa la red
+                otra = ResponseCache(carpeta)
+                await download_all(urls, concurrency=10, cache=otra)
+                if server.requests == 7 and otra.stats.misses == 0:
+                    print("✓ La segunda ejecución se sirve desde el disco")
+                else:
+                    print(f"✗ La segunda ejecución usó la red: {otra.stats}")
+
+                # Con max_age=0 se revalida con ETag y el servidor responde 304
+                vencida = ResponseCache(carpeta, max_age=0)
+                await download_all(urls[:7], cache=vencida)
+                entrada = vencida.lookup(urls[3])
+                if (vencida.stats.revalidated == 7 and server.not_modified == 7
+                        and vencida.read(entrada) == payload(4000)):
+                    print("✓ Entradas vencidas revalidadas con If-None-Match (304)")
+                else:
+                    print(f"✗ Revalidación incorrecta: {vencida.stats}")
+
+                # Hilos: las solicitudes simultáneas a una URL comparten una descarga
+                hilos = ResponseCache(tempfile.mkdtemp())
+                antes = server.requests
+                local = threading.local()
+
+                def tamaño(url):
+                    if not hasattr(local, "session"):
+                        local.session = requests.Session()
+                    return body_size(local.session, url, hilos)
+
+                def descargar():
+                    with ThreadPoolExecutor(max_workers=5) as executor:
+                        return list(executor.map(tamaño, urls))
+
+                tamaños = await asyncio.get_running_loop().run_in_executor(None, descargar)
+                if server.requests - antes == 7 and tamaños == [1000 * (i % 7 + 1) for i in range(70)]:
+                    print(f"✓ Hilos: 7 descargas ({hilos.stats.coalesced} agrupadas en curso)")
+                else:
+                    print(f"✗ Hilos: {server.requests - antes} descargas, {hilos.stats}")
+
+                # LRU por tamaño: al pasar de max_bytes se eliminan las menos usadas
+                lru = ResponseCache(tempfile.mkdtemp(), max_bytes=5000)
+                for n in (2000, 3000, 2000, 4000):
+                    await download_all([server.url(f"/bytes/{n}")], cache=lru)
+                presentes = [lru.lookup(server.url(f"/bytes/{n}")) is not None for n in (2000, 3000, 4000)]
+                if presentes == [False, False, True] and lru.size() <= 5000 and lru.stats.evictions == 2:
+                    print("✓ Expulsión LRU al superar max_bytes")
+                else:
+                    print(f"✗ Expulsión incorrecta: {presentes}, {lru.size()}, {lru.stats}")
+
+        asyncio.run(probar())
+
+    except Exception as e:
+        print(f"✗ Error en caché: {e}")
+
+def test_motor():
+    """Todas las estrategias de fetch_all entregan el mismo registro y respetan reintentos."""
+    print("\nProbando motor de descargas...")
+
+    try:
+        import tempfile
+        from cache_descargas import ResponseCache
+        from motor_descargas import available_strategies, fetch_all
+        from servidor_local import ThreadedServer
+
+        with ThreadedServer() as server:
+            urls = [server.url(f"/bytes/{1000 * (i % 7 + 1)}?delay=0.01") for i in range(35)]
+            esperado = 5 * sum(1000 * k for k in range(1, 8))
+            for estrategia in available_strategies():
+                resultados = fetch_all(urls, strategy=estrategia, concurrency=4, processes=2)
+                trabajadores = {r.worker for r in resultados}
+                if (len(resultados) == 35 and all(r.ok and r.status == 200 for r in resultados)
+                        and sum(r.size for r in resultados) == esperado and all(trabajadores)):
+                    print(f"✓ {estrategia}: 35 descargas, {len(trabajadores)} trabajadores")
+                else:
+                    print(f"✗ {estrategia}: resultados incorrectos")
+
+                # /flaky/2/... falla dos veces con 503; un 404 no se reintenta
+                resultados = fetch_all([server.url(f"/flaky/2/100?{estrategia}"), server.url("/status/404")],
+                                       strategy=estrategia, retries=3, backoff=0.01, concurrency=2)
+                reintentos = sorted((r.status, r.retries, r.ok) for r in resultados)
+                if reintentos == [(200, 2, True), (404, 0, False)]:
+                    print(f"✓ {estrategia}: reintentos ante 503 y no ante 404")
+                else:
+                    print(f"✗ {estrategia}: reintentos incorrectos {reintentos}")
+
+        # hybrid: las copias de una URL van al mismo proceso y los límites suman concurrency
+        with ThreadedServer() as server:
+            urls = [server.url(f"/bytes/{1000 * (i % 7 + 1)}?delay=0.05") for i in range(35)]
+            cache = ResponseCache(tempfile.mkdtemp())
+            resultados = fetch_all(urls, strategy="hybrid", concurrency=3, processes=2, cache=cache)
+            if (len(resultados) == 35 and all(r.ok for r in resultados) and server.requests == 7
+                    and server.max_in_flight <= 3):
+                print(f"✓ hybrid: 7 descargas para 35 URLs, {server.max_in_flight} simultáneas con concurrency=3")
+            else:
+                print(f"✗ hybrid: {server.requests} descargas, {server.max_in_flight} simultáneas")
+
+            # Sin caché cada copia es una descarga: se reparten entre todos los procesos
+            repetida = [server.url("/bytes/100?delay=0.02")] * 40
+            resultados = fetch_all(repetida, strategy="hybrid", concurrency=4, processes=2)
+            por_proceso = {}
+            for r in resultados:
+                proceso = r.worker.split("/")[0]
+                por_proceso[proceso] = por_proceso.get(proceso, 0) + 1
+            if sorted(por_proceso.values()) == [20, 20] and all(r.ok for r in resultados):
+                print("✓ hybrid sin caché: una URL repetida se reparte 20/20 entre 2 procesos")
+            else:
+                print(f"✗ hybrid sin caché: reparto {por_proceso}")
+
+        # multiprocessing con caché: cada URL va a la red una vez y los contadores llegan al padre
+        with ThreadedServer() as server:
+            urls = [server.url(f"/bytes/{1000 * (i % 7 + 1)}?delay=0.05") for i in range(35)]
+            cache = ResponseCache(tempfile.mkdtemp())
+            resultados = fetch_all(urls, strategy="multiprocessing", concurrency=4, cache=cache)
+            if (len(resultados) == 35 and all(r.ok for r in resultados) and server.requests == 7
+                    and cache.stats.misses == 7 and cache.stats.hits == 28):
+                print(f"✓ multiprocessing: 7 descargas para 35 URLs, caché {cache.stats}")
+            else:
+                print(f"✗ multiprocessing: {server.requests} descargas, caché {cache.stats}")
+
+        try:
+            fetch_all([], strategy="inexistente")
+            print("✗ Debería rechazar una estrategia desconocida")
+        except ValueError:
+            print("✓ Estrategia desconocida rechazada")
+
+    except Exception as e:
+        print(f"✗ Error en motor de descargas: {e}")
+
+def test_pipeline():
+    """Las imágenes descargadas con asyncio se procesan en procesos vía memoria compartida."""
+    print("\nProbando pipeline híbrido...")
+
+    try:
+        import os
+        import tempfile
+        from pipeline_hibrido import process_images
+        from servidor_local import ThreadedServer
+
+        with ThreadedServer() as server:
+            urls = [server.url(f"/image/{400 + i % 3 * 100}x300.jpg") for i in range(30)]
+            urls += [server.url("/image/900x900.png"), server.url("/bytes/500"), server.url("/status/404")]
+            carpeta = tempfile.mkdtemp()
+            resultados = []
+            # Bloques de 4 KiB: las imágenes mayores usan un bloque propio
+            reporte = process_images(urls, concurrency=4, processes=2, queue_size=2, size=(64, 64),
+                                     output=carpeta, slot_size=4096, on_result=resultados.append)
+            correctos = [r for r in resultados if r.ok]
+            if (len(correctos) == 31 and all(max(r.output_width, r.output_height) == 64 for r in correctos)
+                    and len(os.listdir(carpeta)) == 4):
+                print("✓ 31 imágenes reducidas a 64 px y guardadas (4 distintas)")
+            else:
+                print(f"✗ Resultados incorrectos: {len(correctos)} correctos")
+            if len(resultados) == 33 and reporte.fetch.failed == 1 and reporte.transform.failed == 1:
+                print("✓ Errores de descarga y de decodificación quedan en el resultado")
+            else:
+                print(f"✗ Errores mal contados: {reporte.fetch.failed}, {reporte.transform.failed}")
+            if (reporte.fetch.items == 32 and reporte.transform.items == 31 and reporte.queue_max <= 2
+                    and reporte.fetch.throughput > 0 and reporte.transform.capacity > 0):
+                print("✓ Reporte por etapa con la cola acotada")
+                print(reporte)
+            else:
+                print(f"✗ Reporte incorrecto:\n{reporte}")
+
+    except Exception as e:
+        print(f"✗ Error en pipeline híbrido: {e}")
+
+def test_benchmark():
+    """El benchmark mide cada combinación y guarda JSON, CSV y el gráfico."""
+    print("\nProbando benchmark de concurrencia...")
+
+    try:
+        import csv
+        import json
+        import os
+        import tempfile
+        from benchmark_concurrencia import build_parser, case_urls, main, percentile
+        from servidor_local import LocalServer
+
+        if percentile([4, 1, 3, 2], 50) == 2.5 and percentile([5], 99) == 5 and percentile(range(101), 95) == 95:
+            print("✓ Percentiles con interpolación lineal")
+        else:
+            print("✗ Percentiles incorrectos")
+
+        for opciones in (["--requests", "20"], ["--requests", "20", "--latency", "0", "--jitter", "0"]):
+            urls = case_urls(LocalServer(port=8000), 100, build_parser().parse_args(opciones))
+            if len(set(urls)) != 20 or not all(url.startswith("http://127.0.0.1:8000/bytes/100?") for url in urls):
+                print(f"✗ URLs del benchmark repetidas o mal formadas: {urls[:2]}")
+                break
+        else:
+            print("✓ Cada solicitud del benchmark usa una URL distinta")
+
+        carpeta = tempfile.mkdtemp()
+        argumentos = ["--strategies", "sync", "threads", "asyncio", "--concurrency", "1", "4",
+                      "--payloads", "100", "5000", "--requests", "12", "--latency", "0.005",
+                      "--error-rate", "0.5", "--warmup", "1", "--repeat", "2", "--output", carpeta]
+        main(argumentos)
+        with open(os.path.join(carpeta, "benchmark.json"), encoding="utf-8") as f:
+            datos = json.load(f)
+        with open(os.path.join(carpeta, "benchmark.csv"), encoding="utf-8") as f:
+            filas = list(csv.DictReader(f))
+        # sync solo con concurrencia 1: (1 + 2 + 2) combinaciones por tamaño
+        if (len(datos) == len(filas) == 10 and all(len(d["run_seconds"]) == 2 for d in datos)
+                and all(d["latency_median"] <= d["latency_p95"] <= d["latency_p99"] for d in datos)
+                and os.path.getsize(os.path.join(carpeta, "benchmark.png")) > 0):
+            print("✓ 10 combinaciones guardadas en JSON, CSV y PNG")
+        else:
+            print(f"✗ Salida incorrecta: {len(datos)} combinaciones")
+        errores = sum(d["errors"] for d in datos)
+        if 0 < errores < 10 * 2 * 12:
+            print(f"✓ Tasa de errores simulada ({errores} de {10 * 2 * 12} solicitudes)")
+        else:
+            print(f"✗ Errores simulados incorrectos: {errores}")
+
+    except Exception as e:
+        print(f"✗ Error en benchmark: {e}")
+
+
+def ejecutar_todas_las_pruebas():
+    """Ejecuta todas las pruebas de descargas."""
+    print("=" * 60)
+    print("PRUEBAS DE DESCARGAS")
+    print("=" * 60)
+
+    test_concurrencia_acotada()
+    test_destinos()
+    test_errores_y_generadores()
+    test_cache()
+    test_motor()
+    test_pipeline()
+    test_benchmark()
+
+    print("\n" + "=" * 60)
+    print("PRUEBAS COMPLETADAS")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    ejecutar_todas_las_pruebas()